@@ -0,0 +1,83 @@
+"""
+Measure the cost of resolving aliases for every file of a large tree, as
+lxfmt does before formatting each of them.
+
+A temporary tree of DIRS directories with FILES files each is made under a
+`.lambdex.cfg` defining aliases, and aliases are resolved for every file,
+both from scratch and through the per-directory cache of the adapters.
+
+Usage: python benchmarks/fmt_aliases.py [-d DIRS] [-f FILES] [--depth DEPTH]
+"""
+import os
+import sys
+import time
+import shutil
+import pathlib
+import argparse
+import tempfile
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+os.environ["LXALIAS"] = "1"
+
+from lambdex.fmt.utils.aliases import AliasesCache
+from lambdex.fmt.core.tkutils.rules import matcher
+
+CONFIG = """\
+[aliases]
+def_ = lx
+if_ = when
+"""
+
+
+def make_tree(root: pathlib.Path, dirs: int, files: int, depth: int) -> list:
+    (root / ".lambdex.cfg").write_text(CONFIG)
+    filenames = []
+    for i in range(dirs):
+        directory = root.joinpath(*["d{}".format(i)] * depth)
+        directory.mkdir(parents=True)
+        for j in range(files):
+            path = directory / "m{}.py".format(j)
+            path.write_text("")
+            filenames.append(str(path))
+    return filenames
+
+
+def uncached(filenames):
+    for filename in filenames:
+        matcher.reset_aliases(filename)
+
+
+def cached(filenames):
+    cache = AliasesCache()
+    for filename in filenames:
+        matcher.set_aliases(cache.get(filename))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-d", "--dirs", type=int, default=50)
+    parser.add_argument("-f", "--files", type=int, default=40)
+    parser.add_argument("--depth", type=int, default=4)
+    opts = parser.parse_args()
+
+    root = pathlib.Path(tempfile.mkdtemp())
+    try:
+        filenames = make_tree(root, opts.dirs, opts.files, opts.depth)
+        print("{:,d} files".format(len(filenames)), file=sys.stderr)
+        for name, func in [("uncached", uncached), ("cached", cached)]:
+            start = time.perf_counter()
+            func(filenames)
+            elapsed = time.perf_counter() - start
+            print(
+                "{:>9s}: {:>7.3f}s, {:>6.1f}us/file".format(
+                    name, elapsed, elapsed / len(filenames) * 1e6
+                )
+            )
+    finally:
+        shutil.rmtree(str(root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Stress the formatter with deeply nested lambdex bodies.
+
+For each depth, a module is generated where every level nests a lambdex
+either inside the head of an `except_` clause or inside an `if_` body, and
+the time spent per token is reported.  The time per token should stay flat
+as the depth grows.
+
+Usage: python benchmarks/fmt_nesting.py [-d DEPTH [DEPTH ...]]
+"""
+import os
+import sys
+import time
+import pathlib
+import argparse
+from io import BytesIO
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("LXALIAS", "1")
+
+from lambdex.fmt.core.api import FormatCode
+from lambdex.fmt.core.tkutils.rules import matcher
+from lambdex.fmt.core.tkutils.tokenize import tokenize
+
+TEMPLATES = {
+    "except_head": "def_(lambda: [try_[a].except_[{}][b].except_[c]])",
+    "if_body": "def_(lambda: [if_[a][{}].elif_[b][c].else_[d]])",
+}
+
+
+def generate(template: str, depth: int) -> bytes:
+    code = "E"
+    for _ in range(depth):
+        code = template.format(code)
+    return "from lambdex import def_\n\nf = {}\n".format(code).encode()
+
+
+def measure(source: bytes, repeat: int) -> float:
+    """
+    Return the best time of formatting `source` in `repeat` runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        FormatCode(BytesIO(source).readline)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-d", "--depths", type=int, nargs="+", default=[25, 50, 100, 200]
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    opts = parser.parse_args()
+
+    matcher.reset_aliases()
+    for name, template in TEMPLATES.items():
+        for depth in opts.depths:
+            source = generate(template, depth)
+            num_tokens = sum(1 for _ in tokenize(BytesIO(source).readline))
+            elapsed = measure(source, opts.repeat)
+            print(
+                "{:>12s} depth={:<5d} {:>8d} tokens {:>8.3f}s {:>8.2f} us/token".format(
+                    name, depth, num_tokens, elapsed, elapsed / num_tokens * 1e6
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure the latency of formatting a line range of growing files, as an
+editor does on save.
+
+For each size, a module is made of copies of `test_demo.src.py`, and the
+statement in the middle is formatted three ways: the whole file, the range
+on a cold start, and the range again after an edit in it.
+
+Usage: python benchmarks/fmt_range.py [-s SIZE [SIZE ...]]
+"""
+import os
+import sys
+import time
+import pathlib
+import argparse
+from io import BytesIO
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+SAMPLE = ROOT_DIR / "tests" / "fmt" / "fmt_samples" / "test_demo.src.py"
+
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("LXALIAS", "1")
+
+from lambdex.fmt.core import ranges
+from lambdex.fmt.core.api import FormatCode
+from lambdex.fmt.core.tkutils.rules import matcher
+
+
+def generate(copies: int) -> bytes:
+    header, body = SAMPLE.read_text().split("\n", 1)
+    bodies = [body.replace("def f():", "def f{}():".format(i)) for i in range(copies)]
+    return "\n".join([header] + bodies).encode()
+
+
+def timed(source: bytes, lines=None) -> float:
+    start = time.perf_counter()
+    FormatCode(BytesIO(source).readline, lines=lines)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=[50, 200, 800])
+    opts = parser.parse_args()
+
+    matcher.reset_aliases()
+    for copies in opts.sizes:
+        source = generate(copies)
+        lines = source.split(b"\n")
+        middle = len(lines) // 2
+        edit = (middle, middle + 1)
+
+        whole = timed(source)
+        ranges._last_content, ranges._last_starts = b"", []
+        cold = timed(source, edit)
+        lines[middle - 1] += b" "
+        warm = timed(b"\n".join(lines), edit)
+
+        print(
+            "{:>7,d} lines: whole {:>7.3f}s, range {:>7.3f}s, "
+            "after edit {:>7.4f}s".format(len(lines), whole, cold, warm)
+        )
+
+
+if __name__ == "__main__":
+    main()
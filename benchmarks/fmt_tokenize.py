@@ -0,0 +1,91 @@
+"""
+Compare the vendored tokenizer with the one built on the C tokenizer, which
+is only available on CPython 3.12+.
+
+A large file is made by repeating the `tests/fmt/fmt_samples` corpus, and
+both tokenizers (including whitespace synthesis) as well as the whole
+formatter are timed on it.
+
+Usage: python benchmarks/fmt_tokenize.py [-n COPIES]
+"""
+import os
+import sys
+import time
+import pathlib
+import argparse
+from io import BytesIO
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+SAMPLES_DIR = ROOT_DIR / "tests" / "fmt" / "fmt_samples"
+
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("LXALIAS", "1")
+
+from lambdex.fmt.core.tkutils import ctokenize
+from lambdex.fmt.core.tkutils.rules import matcher
+from lambdex.fmt.core.tkutils.tokenize import AddWhitespace
+from lambdex.fmt.core.tkutils.builtins import tokenize as bltokenize
+from lambdex.fmt.core.transforms import AsCode, transform
+
+
+def _vendored(readline):
+    return AddWhitespace(bltokenize.tokenize(readline))
+
+
+TOKENIZERS = {
+    "vendored": _vendored,
+    "ctokenize": ctokenize.tokenize,
+}
+
+
+def load_source(copies: int) -> bytes:
+    chunks = [src.read_bytes() for src in sorted(SAMPLES_DIR.rglob("*.src.py"))]
+    # Every sample ends with a newline, or would be joined to the next one
+    chunks = [chunk if chunk.endswith(b"\n") else chunk + b"\n" for chunk in chunks]
+    return b"".join(chunks) * copies
+
+
+def best_of(repeat: int, func, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--copies", type=int, default=50)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    if not ctokenize.AVAILABLE:
+        sys.exit("The C tokenizer is not available on this interpreter.")
+
+    matcher.reset_aliases()
+    source = load_source(opts.copies)
+    print(
+        "{:,d} bytes, {:,d} lines".format(len(source), source.count(b"\n")),
+        file=sys.stderr,
+    )
+
+    outputs = set()
+    for name, tokenize in TOKENIZERS.items():
+        tokenize_only = best_of(
+            opts.repeat, lambda: list(tokenize(BytesIO(source).readline))
+        )
+        whole = best_of(
+            opts.repeat,
+            lambda: outputs.add(AsCode(transform(tokenize(BytesIO(source).readline)))),
+        )
+        print(
+            "{:>10s}: tokenize {:>7.3f}s, format {:>7.3f}s".format(
+                name, tokenize_only, whole
+            )
+        )
+    assert len(outputs) == 1, "tokenizers produce different outputs"
+
+
+if __name__ == "__main__":
+    main()
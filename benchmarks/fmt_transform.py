@@ -0,0 +1,83 @@
+"""
+Measure the throughput of the formatter transform stages on the
+`tests/fmt/fmt_samples` corpus.
+
+Usage: python benchmarks/fmt_transform.py [-n ROUNDS]
+"""
+import os
+import sys
+import time
+import pathlib
+import argparse
+from io import BytesIO
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+SAMPLES_DIR = ROOT_DIR / "tests" / "fmt" / "fmt_samples"
+
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("LXALIAS", "1")
+
+from lambdex.fmt.core.definitions import TokenInfo
+from lambdex.fmt.core.tkutils.rules import matcher
+from lambdex.fmt.core.tkutils.tokenize import tokenize
+from lambdex.fmt.core.transforms import transform
+
+
+def _copy(token: TokenInfo) -> TokenInfo:
+    return TokenInfo(
+        token.type,
+        token.string,
+        token.start,
+        token.end,
+        token.line,
+        token.annotation,
+        token.leading_whitespace,
+    )
+
+
+def load_corpus():
+    """
+    Return a list of annotated token lists, one for each sample.
+    """
+    corpus = []
+    for src in sorted(SAMPLES_DIR.rglob("*.src.py")):
+        matcher.reset_aliases(str(src))
+        corpus.append(list(tokenize(BytesIO(src.read_bytes()).readline)))
+    return corpus
+
+
+def measure(corpus, rounds: int, repeat: int) -> float:
+    """
+    Return the number of input tokens processed per second by `transform()`,
+    taking the best of `repeat` runs.
+    """
+    num_tokens = rounds * sum(map(len, corpus))
+    best = float("inf")
+    for _ in range(repeat):
+        # Stages annotate tokens in place, so each round works on a copy
+        inputs = [
+            [_copy(token) for token in tokens]
+            for _ in range(rounds)
+            for tokens in corpus
+        ]
+        start = time.perf_counter()
+        for tokens in inputs:
+            for _ in transform(tokens):
+                pass
+        best = min(best, time.perf_counter() - start)
+
+    return num_tokens / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--rounds", type=int, default=100)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    corpus = load_corpus()
+    print("{:,.0f} tokens/s".format(measure(corpus, opts.rounds, opts.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure the cost of `import lambdex` with `-X importtime`, and check that the
+compiler is not imported before the first declaration.
+
+Each run starts a fresh interpreter, and the median of the cumulative import
+time of `lambdex` is reported, along with the slowest modules it imports.
+The exit status is non-zero if a module that should be imported lazily is
+imported, or the median exceeds `--max-ms`.
+
+Usage: python benchmarks/import_time.py [-r REPEAT] [--max-ms MS]
+"""
+import os
+import sys
+import pathlib
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+
+# Modules that should only be imported on the first declaration
+LAZY_MODULES = [
+    "lambdex.ast_parser",
+    "lambdex.compiler",
+    "lambdex.compiler.asm.frontend",
+    "threading",
+    "py_compile",
+]
+
+
+def import_times(source: str) -> dict:
+    """
+    Run `source` in a fresh interpreter, and return the cumulative import time
+    of each module imported, in microseconds.
+    """
+    # Lambdexes are compiled from their source, which `-c` does not provide
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script = os.path.join(tmpdir, "script.py")
+        with open(script, "w") as fd:
+            fd.write(source)
+        p = subprocess.run(
+            [sys.executable, "-X", "importtime", script],
+            env=dict(os.environ, PYTHONPATH=str(ROOT_DIR)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        )
+
+    times = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-r", "--repeat", type=int, default=15)
+    parser.add_argument("-n", "--top", type=int, default=8)
+    parser.add_argument("--max-ms", type=float, default=None)
+    opts = parser.parse_args()
+
+    runs = [import_times("import lambdex") for _ in range(opts.repeat)]
+    median = statistics.median(run["lambdex"] for run in runs) / 1000
+    print("import lambdex: {:.1f}ms (median of {})".format(median, opts.repeat))
+
+    last = runs[-1]
+    slowest = sorted(last, key=last.get, reverse=True)[1 : opts.top + 1]
+    for name in slowest:
+        print("  {:>7.1f}ms  {}".format(last[name] / 1000, name))
+
+    first_use = import_times("from lambdex import def_\ndef_(lambda: [pass_])\n")
+    print(
+        "first declaration imports {} more modules".format(len(first_use) - len(last))
+    )
+
+    failed = False
+    for name in LAZY_MODULES:
+        if name in last:
+            print("{} is imported eagerly".format(name), file=sys.stderr)
+            failed = True
+    if opts.max_ms is not None and median > opts.max_ms:
+        print("import time exceeds {}ms".format(opts.max_ms), file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
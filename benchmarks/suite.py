@@ -0,0 +1,368 @@
+"""
+Run the benchmark suite of the compiler, the asm transpiler and the
+formatter, and report the results as text or JSON.
+
+Benchmarks are plain timing loops depending on the standard library only,
+and each result is the best of `--repeat` runs.  The JSON output of a run can
+be passed to `--compare` later, in order to spot regressions between
+releases.
+
+Usage:
+    python benchmarks/suite.py [-q] [-b NAME [NAME ...]] [-o RESULTS.json]
+    python benchmarks/suite.py --compare BASE.json [--threshold PERCENT]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import pathlib
+import argparse
+import platform
+import tempfile
+import linecache
+import subprocess
+from io import BytesIO
+from collections import OrderedDict
+
+ROOT_DIR = pathlib.Path(__file__).absolute().parent.parent
+SAMPLES_DIR = ROOT_DIR / "tests" / "fmt" / "fmt_samples"
+
+sys.path.insert(0, str(ROOT_DIR))
+
+import lambdex
+from lambdex import def_
+from lambdex.compiler import core, cache
+
+BENCHMARKS = OrderedDict()
+
+
+class Result:
+    """
+    Outcome of a benchmark, where `value` is measured in `unit`.
+    """
+
+    __slots__ = ["value", "unit", "higher_is_better"]
+
+    def __init__(self, value: float, unit: str, higher_is_better: bool = False):
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def as_dict(self) -> dict:
+        return {
+            "value": self.value,
+            "unit": self.unit,
+            "higher_is_better": self.higher_is_better,
+        }
+
+
+class Skipped(Exception):
+    pass
+
+
+def benchmark(name: str):
+    def _inner(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return _inner
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """
+    Return the shortest time in seconds taken by `func(*args)` in `repeat` runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@benchmark("import.lambdex")
+def bench_import(opts) -> Result:
+    from import_time import import_times
+
+    best = min(
+        import_times("import lambdex")["lambdex"] for _ in range(opts.repeat * 3)
+    )
+    return Result(best / 1000, "ms")
+
+
+def _declare(x):
+    return def_(lambda: [
+        if_[x > 0] [
+            y < x * 2,
+        ].elif_[x < 0] [
+            y < -x,
+        ].else_ [
+            y < 0,
+        ],
+        for_[i in range(y)] [
+            if_[i % 3 == 0] [
+                continue_,
+            ],
+            x < x + i,
+        ],
+        return_[x],
+    ])
+
+
+def _declare_many(number: int):
+    for i in range(number):
+        _declare(i)
+
+
+@benchmark("compile.cold")
+def bench_compile_cold(opts) -> Result:
+    number = opts.scale * 20
+    cache.set_enabled(False)
+    try:
+        best = best_of(opts.repeat, _declare_many, number)
+    finally:
+        cache.set_enabled(True)
+    return Result(best / number * 1e6, "us/lambdex")
+
+
+@benchmark("compile.cache_hit")
+def bench_compile_cache_hit(opts) -> Result:
+    number = opts.scale * 5000
+    _declare(0)
+    best = best_of(opts.repeat, _declare_many, number)
+    return Result(best / number * 1e6, "us/call")
+
+
+@benchmark("compile.wrap")
+def bench_compile_wrap(opts) -> Result:
+    number = opts.scale * 10000
+
+    # Record the arguments that a cache hit rebinds the code object with
+    recorded = []
+    wrap = core._wrap_code_object
+    core._wrap_code_object = lambda *args: recorded.append(args) or wrap(*args)
+    try:
+        _declare(0)
+        _declare(0)
+    finally:
+        core._wrap_code_object = wrap
+    args = recorded[-1]
+
+    def _wrap_many():
+        for _ in range(number):
+            wrap(*args)
+
+    return Result(best_of(opts.repeat, _wrap_many) / number * 1e6, "us/call")
+
+
+@benchmark("compile.elif_chain")
+def bench_compile_elif_chain(opts) -> Result:
+    num_branches = 1000
+    branch = ".elif_[x == {0}] [\n        y < x * {0},\n        return_[y],\n    ]"
+    source = (
+        "from lambdex import def_\n"
+        "f = def_(lambda x: [\n"
+        "    if_[x == 0] [\n        return_[0],\n    ]"
+        + "".join(branch.format(i) for i in range(1, num_branches))
+        + ".else_ [\n        return_[-1],\n    ],\n])\n"
+    )
+
+    # CPython itself needs a higher limit to parse such a long chain
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10000))
+    tmpdir = tempfile.mkdtemp()
+    cache.set_enabled(False)
+    try:
+        filename = os.path.join(tmpdir, "elif_chain.py")
+        with open(filename, "w") as fd:
+            fd.write(source)
+        code = compile(source, filename, "exec")
+        best = best_of(opts.repeat, exec, code, {"__file__": filename})
+    finally:
+        cache.set_enabled(True)
+        sys.setrecursionlimit(limit)
+        linecache.checkcache()
+        shutil.rmtree(tmpdir)
+
+    return Result(best / num_branches * 1e6, "us/branch")
+
+
+_MODULE_TEMPLATE = '''
+def f{0}(a):
+    g = def_(lambda b: [
+        if_[a > b] [
+            return_[a - b],
+        ],
+        for_[i in range(b)] [
+            a < a + i,
+        ],
+        return_[a],
+    ])
+    return g(a)
+'''
+
+
+@benchmark("asm.transpile")
+def bench_asm_transpile(opts) -> Result:
+    try:
+        from lambdex.compiler.asm.core import transpile
+    except (ImportError, KeyError):
+        raise Skipped("the asm transpiler does not support this interpreter")
+
+    num_lambdexes = opts.scale * 50
+    source = "from lambdex import def_\n" + "".join(
+        _MODULE_TEMPLATE.format(i) for i in range(num_lambdexes)
+    )
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmpdir, "synthetic.py")
+        with open(filename, "w") as fd:
+            fd.write(source)
+        code = compile(source, filename, "exec")
+        best = best_of(opts.repeat, transpile, code, True)
+    finally:
+        linecache.checkcache()
+        shutil.rmtree(tmpdir)
+
+    return Result(num_lambdexes / best, "lambdexes/s", higher_is_better=True)
+
+
+def _load_samples():
+    return [src.read_bytes() for src in sorted(SAMPLES_DIR.rglob("*.src.py"))]
+
+
+@benchmark("fmt.format")
+def bench_fmt_format(opts) -> Result:
+    from lambdex.fmt.core.api import FormatCode
+    from lambdex.fmt.core.tkutils.rules import matcher
+    from lambdex.fmt.core.tkutils.builtins import tokenize
+
+    matcher.reset_aliases()
+    samples = _load_samples()
+    num_tokens = sum(
+        len(list(tokenize.tokenize(BytesIO(source).readline))) for source in samples
+    )
+
+    def _format_all():
+        for _ in range(opts.scale):
+            for source in samples:
+                FormatCode(BytesIO(source).readline)
+
+    best = best_of(opts.repeat, _format_all)
+    return Result(num_tokens * opts.scale / best, "tokens/s", higher_is_better=True)
+
+
+@benchmark("fmt.lxfmt")
+def bench_fmt_lxfmt(opts) -> Result:
+    samples = _load_samples()
+    num_files = opts.scale * 10 * len(samples)
+    num_lines = opts.scale * 10 * sum(s.count(b"\n") + 1 for s in samples)
+
+    tmpdir = pathlib.Path(tempfile.mkdtemp())
+    try:
+        filenames = []
+        for i in range(num_files):
+            path = tmpdir / "m{}.py".format(i)
+            path.write_bytes(samples[i % len(samples)])
+            filenames.append(str(path))
+
+        # `-q` exits with 1 whenever a file would be changed, which is always
+        # the case for the samples, so discard the output instead
+        cmd = [sys.executable, "-m", "lambdex.fmt"] + filenames
+        env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+        best = best_of(
+            opts.repeat,
+            lambda: subprocess.run(
+                cmd,
+                cwd=str(tmpdir),
+                env=env,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            ),
+        )
+    finally:
+        shutil.rmtree(str(tmpdir))
+
+    return Result(num_lines / best, "lines/s", higher_is_better=True)
+
+
+def run(opts) -> OrderedDict:
+    results = OrderedDict()
+    for name, func in BENCHMARKS.items():
+        if opts.benchmarks and not any(name.startswith(b) for b in opts.benchmarks):
+            continue
+        try:
+            result = func(opts)
+        except Skipped as exc:
+            print("{:<20s} skipped: {}".format(name, exc), file=sys.stderr)
+            continue
+        results[name] = result
+        print("{:<20s} {:>14,.2f} {}".format(name, result.value, result.unit))
+    return results
+
+
+def compare(base: dict, results: OrderedDict, threshold: float) -> bool:
+    """
+    Print the improvement of each benchmark over `base` in percent.  Return
+    True if any of them regresses by more than `threshold` percent.
+    """
+    regressed = False
+    base_results = base["results"]
+    for name, result in results.items():
+        if name not in base_results:
+            continue
+        old = base_results[name]["value"]
+        improvement = (result.value - old) / old * 100
+        if not result.higher_is_better:
+            improvement = -improvement
+
+        mark = ""
+        if improvement < -threshold:
+            mark = "  REGRESSION"
+            regressed = True
+        print("{:<20s} {:>+8.1f}%{}".format(name, improvement, mark))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-b", "--benchmarks", nargs="+", metavar="NAME")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-q", "--quick", action="store_true", help="run fewer loops")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="BASE", help="compare with a JSON")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    opts = parser.parse_args()
+    opts.scale = 1 if opts.quick else 5
+
+    results = run(opts)
+
+    if opts.output:
+        with open(opts.output, "w") as fd:
+            json.dump(
+                {
+                    "lambdex": lambdex.__version__,
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "platform": platform.platform(),
+                    "timestamp": time.time(),
+                    "results": {k: v.as_dict() for k, v in results.items()},
+                },
+                fd,
+                indent=2,
+            )
+
+    if opts.compare:
+        with open(opts.compare) as fd:
+            base = json.load(fd)
+        print("\nimprovement over {}:".format(opts.compare))
+        if compare(base, results, opts.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
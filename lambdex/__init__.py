@@ -39,6 +39,29 @@ else:
     from ._exports import *
     from ._exports import __all__
 
+    # Module __getattr__ below is unavailable before Python 3.7, so the
+    # submodules are imported eagerly to keep them reachable as attributes
+    if sys.version_info < (3, 7):
+        from . import ast_parser, compiler, manifest
+
 del os, sys, _is_run_as_script
 
+# Submodules that were imported along with lambdex, before the compiler was
+# imported lazily
+_LAZY_SUBMODULES = frozenset(["compiler", "ast_parser", "manifest"])
+
+
+def __getattr__(name):
+    """
+    Import the submodule `name` on its first access as an attribute, so that
+    `lambdex.compiler` works after a plain `import lambdex`.
+    """
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        return importlib.import_module("." + name, __name__)
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
 __version__ = "1.0.0"
@@ -6,6 +6,7 @@ aliases or styles.
 from typing import List, Optional
 
 import os
+import time
 import pathlib
 import configparser
 
@@ -29,8 +30,8 @@ def _walk_parents(paths: List[pathlib.Path]):
     for path in paths:
         path = pathlib.Path(path).absolute()
 
-        # If path is a file, walk upwards
-        if _is_readable_file(path):
+        # If path is not a directory (e.g., a file), walk upwards
+        if not os.path.isdir(str(path)):
             path = path.parent
 
         # Walk upwards until reach the root
@@ -49,6 +50,101 @@ def _walk_parents(paths: List[pathlib.Path]):
             path = path.parent
 
 
+class _DirCache:
+    """
+    Remember whether directories contain a readable config file.
+
+    An entry is keyed by the path of the config file, and is valid as long as
+    the modification time of its directory is unchanged, which is updated
+    whenever an entry in the directory is created, removed or renamed.  A
+    directory modified just now is not cached, since a following change may
+    not update its modification time on file systems with coarse timestamps.
+
+    Note that changing the permissions of a config file (e.g., by `chmod`)
+    does not update the modification time of its directory, so the cached
+    readability of the file is stale until an entry in the directory changes.
+
+    If `path` is given, the entries are loaded from and saved to that file,
+    so that they persist across processes.
+    """
+
+    # Seconds after a modification, during which a directory is not cached
+    _SETTLE_TIME = 2
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._entries = {}
+        self._dirty = False
+        if path is not None:
+            self._load()
+
+    def _load(self):
+        import json
+
+        try:
+            with open(self._path, "r", encoding="utf-8") as fd:
+                entries = json.load(fd)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def save(self):
+        """
+        Write the entries to the cache file, if any of them are updated.
+        """
+        if self._path is None or not self._dirty:
+            return
+
+        import json
+
+        tmp_path = "{}.{}.tmp".format(self._path, os.getpid())
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fd:
+                json.dump(self._entries, fd)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        else:
+            self._dirty = False
+
+    def contains_config(self, directory: pathlib.Path, filename: str) -> bool:
+        directory = str(directory)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return False
+
+        cfg_file = os.path.join(directory, filename)
+        entry = self._entries.get(cfg_file)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        found = _is_readable_file(cfg_file)
+        if mtime < (time.time() - self._SETTLE_TIME) * 1e9:
+            self._entries[cfg_file] = [mtime, found]
+            self._dirty = True
+        return found
+
+
+_dir_cache = None
+
+
+def _get_dir_cache() -> _DirCache:
+    """
+    Return the directory cache, which is persisted to `$LXCFG_CACHE` if the
+    envvar is set.
+    """
+    global _dir_cache
+    path = os.getenv("LXCFG_CACHE") or None
+    if _dir_cache is None or _dir_cache._path != path:
+        _dir_cache = _DirCache(path)
+    return _dir_cache
+
+
 def _find_config_file(
     userpaths: List[str], filename=".lambdex.cfg"
 ) -> Optional[pathlib.Path]:
@@ -62,10 +158,21 @@ def _find_config_file(
     For each path, we try all of its parents until reach the root.
 
     If envvar LXNOCFG set, simply return None (don't use any config files).
+    If envvar LXCFG set, return the path it specifies without searching, or
+    raise FileNotFoundError if it is not a readable file.
     """
     if os.getenv("LXNOCFG") is not None:
         return None
 
+    explicit_path = os.getenv("LXCFG")
+    if explicit_path:
+        path = pathlib.Path(explicit_path).absolute()
+        if not _is_readable_file(path):
+            raise FileNotFoundError(
+                "LXCFG={!r} is not a readable file".format(explicit_path)
+            )
+        return path
+
     paths = []
 
     # Append importer path if available.
@@ -79,15 +186,49 @@ def _find_config_file(
     # Apeend CWD
     paths.append(os.getcwd())
 
-    for path in _walk_parents(paths):
-        cfg_file = path / filename
-        # Check if the file exists and is readable
-        if _is_readable_file(cfg_file):
-            return cfg_file
+    dir_cache = _get_dir_cache()
+    try:
+        for path in _walk_parents(paths):
+            if dir_cache.contains_config(path, filename):
+                return path / filename
+    finally:
+        dir_cache.save()
 
     return None
 
 
+# Mapping from config paths to their stamps and parsers
+_parsed = {}
+
+
+def _stamp(path: pathlib.Path):
+    """
+    Return a value that changes whenever the file at `path` is modified.
+    """
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_config(path: Optional[pathlib.Path]) -> configparser.ConfigParser:
+    """
+    Return a parser that has read from `path`.  The parser is reused until the
+    file is modified.
+    """
+    if path is None:
+        return configparser.ConfigParser()
+
+    stamp = _stamp(path)
+    cached = _parsed.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    parser = configparser.ConfigParser()
+    with path.open("r", encoding="utf-8") as fd:
+        parser.read_file(fd)
+    _parsed[path] = stamp, parser
+    return parser
+
+
 _parser = None
 _config_path = None
 
@@ -105,10 +246,7 @@ def get_parser(userpaths: List[str], reinit=False) -> configparser.ConfigParser:
     global _parser, _config_path
     if _parser is None or reinit:
         _config_path = _find_config_file(userpaths)
-        _parser = configparser.ConfigParser()
-        if _config_path is not None:
-            with _config_path.open("r", encoding="utf-8") as fd:
-                _parser.read_file(fd)
+        _parser = _read_config(_config_path)
 
     return _parser
 
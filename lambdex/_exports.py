@@ -1,6 +1,16 @@
 from .keywords import *
 from .keywords import __all__
 
-from .compiler.asm.frontend import asmopt
+
+def asmopt(func):
+    """
+    Optimize the bytecodes of `func` by eliminating runtime lambdex transpilation.
+
+    The bytecode transpiler is imported on the first use.
+    """
+    from .compiler.asm.frontend import asmopt
+
+    return asmopt(func)
+
 
 __all__ = __all__ + ["asmopt"]
@@ -8,12 +8,14 @@ import linecache
 from itertools import chain
 
 from lambdex.utils.ast import ast_from_source
-from lambdex.compiler import error
+from lambdex.compiler import error, profiler
+from lambdex import manifest
 
 from lambdex._aliases import get_aliases, get_declarers
 
 __all__ = [
     "lambda_to_ast",
+    "shift_to_keyword",
     "find_lambdex_ast_in_code",
     "LambdexASTLookupKey",
     "LambdexASTLookupTable",
@@ -101,6 +103,21 @@ def _make_pattern(keyword: str, identifier: str):
     return _pattern
 
 
+def shift_to_keyword(node: ast.Call) -> ast.Call:
+    """
+    Shift column offsets of `node` in place, to be the same as it is parsed
+    from the source by `lambda_to_ast()`, where its first line starts at the
+    keyword.
+    """
+    lineno, offset = node.lineno, node.col_offset
+    for child in ast.walk(node):
+        if getattr(child, "lineno", None) == lineno:
+            child.col_offset -= offset
+        if getattr(child, "end_lineno", None) == lineno:
+            child.end_col_offset -= offset
+    return node
+
+
 def _raise_ambiguity(node, filename, keyword, identifier):
     """
     Raise SyntaxError reporting an ambiguious declaration.
@@ -114,13 +131,22 @@ def lambda_to_ast(
 ):
     """
     Returns the AST of `lambda_object`.
-    """
-    tree = ast_from_source(lambda_object, keyword)
-    if isinstance(tree, ast.Expr):
-        assert not isinstance(tree.value, ast.Lambda)
 
-    pattern = _make_pattern(keyword, identifier)
-    matched = list(_shallow_match_ast(tree, pattern))
+    The AST is taken from the manifest of its module if it is found there,
+    otherwise it is parsed from the source.
+    """
+    matched = manifest.find_declarations(lambda_object, keyword, identifier)
+    if matched:
+        profiler.lap("source")
+    else:
+        tree = ast_from_source(lambda_object, keyword)
+        profiler.lap("source")
+        if isinstance(tree, ast.Expr):
+            assert not isinstance(tree.value, ast.Lambda)
+
+        pattern = _make_pattern(keyword, identifier)
+        matched = list(_shallow_match_ast(tree, pattern))
+        profiler.lap("match")
 
     if not len(matched):
         raise SyntaxError("cannot parse lambda for unknown reason")
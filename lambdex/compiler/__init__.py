@@ -1 +1,3 @@
-from .core import compile_lambdex
+from .core import compile_lambdex, compile_file
+from .profiler import set_profiler, get_profiler
+from .warmup import warm_up
@@ -600,8 +600,9 @@ def _rewrite_code(
             # Use the block key to find corresponding AST, and obtained
             # the compiled code object
             astdef = asttab[curr_block.key]
+            # The rewritten bytecodes always store the function in a new cell
             lambdex_code, _, fvmapping = _compile(
-                astdef, code.co_filename, curr_block.freevars
+                astdef, code.co_filename, curr_block.freevars, bind_callee=True
             )
 
             curr_block.compiled_code = lambdex_code
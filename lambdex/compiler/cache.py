@@ -1,6 +1,8 @@
 __all__ = [
     "get",
     "set",
+    "contains",
+    "update",
     "set_enabled",
     "is_enabled",
 ]
@@ -33,6 +35,24 @@ def set(declarer, value):
     _cache[key] = value
 
 
+def contains(key) -> bool:
+    """
+    Check whether `key` is in the cache.
+    """
+    return key in _cache
+
+
+def update(entries: dict):
+    """
+    Store `entries` mapping keys to values into the cache in bulk.  Keys
+    existing in cache are kept as is.
+    """
+    if not __enabled__:
+        return
+    for key, value in entries.items():
+        _cache.setdefault(key, value)
+
+
 def set_enabled(value: bool):
     """
     Enable or disable the cache.
@@ -60,9 +60,20 @@ class Context:
     - `globals`: a dict containing globalvars of currently compiling lambdex
     - `used_names`: a set containing currently occupied names
     - `frames`: current `Frame` stack
+    - `keyword_free`: a set of nodes that need not to be compiled as expressions
+    - `dispatch_table`: a dict mapping `(node class, flag)` to dispatch functions
     """
 
-    __slots__ = ["compile", "globals", "used_names", "frames", "filename", "renames"]
+    __slots__ = [
+        "compile",
+        "globals",
+        "used_names",
+        "frames",
+        "filename",
+        "renames",
+        "keyword_free",
+        "dispatch_table",
+    ]
 
     def __init__(self, compile_fn, globals_dict, filename):
         self.compile = partial(compile_fn, ctx=self)
@@ -71,6 +82,8 @@ class Context:
         self.frames = []
         self.filename = filename
         self.renames = {}
+        self.keyword_free = frozenset()
+        self.dispatch_table = {}
 
     def select_name(self, prefix):
         """
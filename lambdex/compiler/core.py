@@ -2,19 +2,26 @@ import ast
 import types
 import typing
 import inspect
+import linecache
 import functools
 
 from ..utils import compat
-from .rules import Rules
 from .context import Context, ContextFlag
-from .dispatcher import Dispatcher
+from .dispatcher import NO_RULE, get_table, find_keyword_free_nodes
 from . import cache
+from . import profiler
+from . import counters
 from .asm.frontend import transpile_file
 
-from lambdex.utils.ast import pformat, empty_arguments, None_node
+from lambdex.utils.ast import (
+    pformat,
+    empty_arguments,
+    None_node,
+    fix_missing_locations,
+)
 from lambdex.utils import compat
 
-__all__ = ["compile_lambdex"]
+__all__ = ["compile_lambdex", "compile_file"]
 
 # This flag is used internally. when turned on:
 #  - compiled lambdex will have attribute `__ast__`
@@ -22,43 +29,77 @@ __all__ = ["compile_lambdex"]
 __DEBUG__ = False
 
 
-def compile_node(node, ctx, *, flag=ContextFlag.should_be_expr):
+def _apply_rule(node, ctx, flag):
     """
-    Compile an AST node `node` to transpile lambdex syntax to Python lambdex.
+    Compile `node` with the rule it matches.  Return `NO_RULE` if no rule
+    matches.
     """
-    if node is None:
-        return None
+    dispatch = ctx.dispatch_table.get((node.__class__, flag))
+    if dispatch is None:
+        return NO_RULE
 
-    dispatcher = Dispatcher.get(node.__class__)
-    rule_id, extra_args = dispatcher(node, ctx, flag)
-    rule = Rules.get(rule_id, None)
+    return dispatch(node, ctx)
 
-    if rule is not None:
-        return rule(node, ctx, *extra_args)
 
-    # If no rule found, recursively compile children of `node`
+def _compile_children(node, ctx):
+    """
+    Compile the children of `node` in place, and yield each child that matches
+    no rule, whose children should be compiled before the next sibling.
+    """
+    keyword_free = ctx.keyword_free
     for field, old_value in ast.iter_fields(node):
         if isinstance(old_value, list):
             new_values = []
             for value in old_value:
-                if isinstance(value, ast.AST):
-                    value = compile_node(value, ctx)
-
-                    if value is None:
+                if isinstance(value, ast.AST) and value not in keyword_free:
+                    new_value = _apply_rule(value, ctx, ContextFlag.should_be_expr)
+                    if new_value is NO_RULE:
+                        yield value
+                    elif new_value is None:
                         # Discard from `new_values`
                         continue
-                    elif not isinstance(value, ast.AST):
-                        new_values.extend(value)
+                    elif not isinstance(new_value, ast.AST):
+                        new_values.extend(new_value)
                         continue
+                    else:
+                        value = new_value
                 new_values.append(value)
             old_value[:] = new_values
-        elif isinstance(old_value, ast.AST):
-            new_node = compile_node(old_value, ctx)
-            if new_node is None:
+        elif isinstance(old_value, ast.AST) and old_value not in keyword_free:
+            new_node = _apply_rule(old_value, ctx, ContextFlag.should_be_expr)
+            if new_node is NO_RULE:
+                yield old_value
+            elif new_node is None:
                 delattr(node, field)
             else:
                 setattr(node, field, new_node)
 
+
+def compile_node(node, ctx, *, flag=ContextFlag.should_be_expr):
+    """
+    Compile an AST node `node` to transpile lambdex syntax to Python lambdex.
+
+    Expressions in `ctx.keyword_free` are returned as is.  Children of nodes
+    that match no rule are compiled depth-first with an explicit stack.
+    """
+    if node is None:
+        return None
+
+    if flag is ContextFlag.should_be_expr and node in ctx.keyword_free:
+        return node
+
+    new_node = _apply_rule(node, ctx, flag)
+    if new_node is not NO_RULE:
+        return new_node
+
+    stack = [_compile_children(node, ctx)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+        else:
+            stack.append(_compile_children(child, ctx))
+
     return node
 
 
@@ -76,21 +117,25 @@ def _wrap_code_object(
     `lambda_func`.
     """
 
-    # Trick: Obtain a cell object referencing current function, by
-    # constructing a new function and extract its closure.
-    callee_ref_cell = (lambda: ret).__closure__[0]
+    closure = lambda_func.__closure__
+    if -1 in fvmapping:
+        # Trick: Obtain a cell object referencing current function, by
+        # constructing a new function and extract its closure.
+        callee_ref_cell = (lambda: ret).__closure__[0]
 
-    # Rebuild the closure
-    new_closure = tuple(
-        lambda_func.__closure__[i] if i >= 0 else callee_ref_cell for i in fvmapping
-    )
+        # Rebuild the closure
+        new_closure = tuple(
+            closure[i] if i >= 0 else callee_ref_cell for i in fvmapping
+        )
+    else:
+        new_closure = tuple(closure[i] for i in fvmapping) or None
 
     ret = types.FunctionType(
         code=code_obj,
         globals=lambda_func.__globals__,
         name=code_obj.co_name,
         argdefs=lambda_func.__defaults__,
-        closure=tuple(new_closure),
+        closure=new_closure,
     )
 
     if __DEBUG__:
@@ -133,35 +178,18 @@ def _resolve_freevars_mapping(
     return [mapping.get(varname, -1) for varname in new_freevars]
 
 
-def _compile(
-    ast_node: ast.AST,
-    filename: str,
-    freevars: typing.Sequence[str],
-    globals: typing.Optional[dict] = None,
-) -> typing.Tuple[types.CodeType, ast.AST, typing.Sequence[int]]:
+def _make_wrapper(
+    lambdex_node: ast.FunctionDef, freevars: typing.Sequence[str], ctx: Context
+) -> ast.FunctionDef:
     """
-    An internal function that do the compilation.
+    Wrap `lambdex_node` in a FunctionDef where names in `freevars` are local.
     """
-    if globals is None:
-        globals = {}
-
-    context = Context(
-        compile_node,
-        globals,
-        filename,
-    )
-    lambdex_node = compile_node(
-        ast_node,
-        ctx=context,
-        flag=ContextFlag.outermost_lambdex,
-    )
-
     # A name in `lambdex_node` should be compiled as nonlocal instead of
     # global (default) if it appears in `freevars`.
     #
     # This is done by wrapping `lambdex_node` in another FunctionDef, and
     # let names in `freevars` become local variables in the wrapper.
-    wrapper_name = context.select_name_and_use("wrapper")
+    wrapper_name = ctx.select_name_and_use("wrapper")
     if freevars:
         wrapper_body = [
             ast.Assign(
@@ -173,18 +201,84 @@ def _compile(
     else:
         wrapper_body = [lambdex_node]
 
-    wrapper_node = ast.FunctionDef(
+    return ast.FunctionDef(
         name=wrapper_name,
         args=empty_arguments,
         body=wrapper_body,
         decorator_list=[],
         returns=None,
     )
+
+
+def _unwrap_code_object(
+    wrapper_code: types.CodeType,
+    lambdex_node: ast.FunctionDef,
+    freevars: typing.Sequence[str],
+    ctx: Context,
+    bind_callee: bool,
+) -> typing.Tuple[types.CodeType, typing.Sequence[int]]:
+    """
+    Extract the code object of `lambdex_node` from `wrapper_code`, and return it
+    with its freevars mapping.
+    """
+    # the desired code object should be in `wrapper_code.co_consts`
+    # we use `.co_name` to identify
+    for obj in wrapper_code.co_consts:
+        if inspect.iscode(obj) and obj.co_name == lambdex_node.name:
+            lambdex_code = obj
+            break
+
+    # Append code object name to its co_freevars if required, so that
+    # lambdex can always access itself via its name `anonymous_...`
+    callee_name = lambdex_code.co_name
+    if bind_callee and callee_name not in lambdex_code.co_freevars:
+        lambdex_code = compat.code_replace(
+            lambdex_code,
+            co_freevars=(*lambdex_code.co_freevars, callee_name),
+        )
+    freevars_mapping = _resolve_freevars_mapping(freevars, lambdex_code.co_freevars)
+
+    lambdex_code = _rename_code_object(lambdex_code, ctx)
+
+    return lambdex_code, freevars_mapping
+
+
+def _compile(
+    ast_node: ast.AST,
+    filename: str,
+    freevars: typing.Sequence[str],
+    globals: typing.Optional[dict] = None,
+    *,
+    bind_callee: bool = False,
+) -> typing.Tuple[types.CodeType, ast.AST, typing.Sequence[int]]:
+    """
+    An internal function that do the compilation.
+
+    The lambdex references itself via a cell only if it uses `callee_`, or if
+    `bind_callee` is True.
+    """
+    if globals is None:
+        globals = {}
+
+    context = Context(
+        compile_node,
+        globals,
+        filename,
+    )
+    context.dispatch_table = get_table()
+    context.keyword_free = find_keyword_free_nodes(ast_node)
+    lambdex_node = compile_node(
+        ast_node,
+        ctx=context,
+        flag=ContextFlag.outermost_lambdex,
+    )
+    profiler.lap("compile_node")
+
     module_node = ast.Module(
-        body=[wrapper_node],
+        body=[_make_wrapper(lambdex_node, freevars, context)],
         type_ignores=[],
     )
-    module_node = ast.fix_missing_locations(module_node)
+    module_node = fix_missing_locations(module_node)
 
     if __DEBUG__:
         try:
@@ -193,34 +287,141 @@ def _compile(
             raise SyntaxError(pformat(module_node)) from e
     else:
         module_code = compile(module_node, filename, "exec")
+    profiler.lap("compile")
 
     # unwrap the outer FunctionDef.
     # since no other definition in the module, it should be co_consts[0]
-    wrapper_code = module_code.co_consts[0]
+    lambdex_code, freevars_mapping = _unwrap_code_object(
+        module_code.co_consts[0], lambdex_node, freevars, context, bind_callee
+    )
+    profiler.lap("rename")
 
-    # the desired code object should be in `module_code.co_consts`
-    # we use `.co_name` to identify
-    for obj in wrapper_code.co_consts:
-        if inspect.iscode(obj) and obj.co_name == lambdex_node.name:
-            lambdex_code = obj
-            break
+    return lambdex_code, lambdex_node, freevars_mapping
 
-    # Append code object name to its co_freevars, so that lambdex
-    # can always access itself via its name `anonymous_...`
-    callee_name = lambdex_code.co_name
-    try:
-        callee_index = lambdex_code.co_freevars.index(callee_name)
-    except ValueError:
-        callee_index = len(lambdex_code.co_freevars)
-        lambdex_code = compat.code_replace(
-            lambdex_code,
-            co_freevars=(*lambdex_code.co_freevars, callee_name),
+
+def _find_lambda_code_objects(
+    code: types.CodeType,
+) -> typing.Dict[int, typing.List[types.CodeType]]:
+    """
+    Return the code objects of lambdas nested in `code`, keyed by
+    `co_firstlineno`.
+    """
+    lambda_codes = {}
+    todo = [code]
+    while todo:
+        code = todo.pop()
+        for const in code.co_consts:
+            if inspect.iscode(const):
+                if const.co_name == "<lambda>":
+                    lambda_codes.setdefault(const.co_firstlineno, []).append(const)
+                todo.append(const)
+
+    return lambda_codes
+
+
+def compile_file(
+    filename: str, globals: typing.Optional[dict] = None, *, transpile=True
+) -> int:
+    """
+    Compile all lambdex declarations in the source file `filename` in a batch,
+    and populate the cache with them.  Return the number of declarations
+    newly cached.
+
+    The declarations are lowered into a single synthetic module, which is
+    compiled by one `compile()` call.  `filename` should be the path that the
+    module is imported from, and `globals` the namespace of the module if
+    available.  A module may call `compile_file(__file__, globals())` before
+    its declarations.
+
+    If `transpile` is True, the module is also queued for the bytecode
+    transpiler, as a declaration compiled at runtime would do.
+
+    Declarations that can not be told apart by the line of their lambdas, or
+    fail to compile, are skipped, and compiled one by one when declared.
+    """
+    from lambdex.keywords import make_key
+    from lambdex.ast_parser import (
+        _make_pattern,
+        _shallow_match_ast,
+        shift_to_keyword,
+    )
+
+    if not cache.is_enabled():
+        return 0
+
+    source = "".join(linecache.getlines(filename))
+    if not source:
+        return 0
+    tree = ast.parse(source, filename)
+    lambda_codes = _find_lambda_code_objects(
+        compile(tree, filename, "exec", dont_inherit=True)
+    )
+
+    declarations = {}
+    iterator = _shallow_match_ast(
+        tree, _make_pattern(None, None), yield_node_only=False
+    )
+    for node, (keyword, identifier) in iterator:
+        declarations.setdefault(node.args[0].lineno, []).append(
+            (node, keyword, identifier)
         )
-    freevars_mapping = _resolve_freevars_mapping(freevars, lambdex_code.co_freevars)
 
-    lambdex_code = _rename_code_object(lambdex_code, context)
+    context = Context(compile_node, globals or {}, filename)
+    context.dispatch_table = get_table()
+    context.keyword_free = find_keyword_free_nodes(tree)
 
-    return lambdex_code, lambdex_node, freevars_mapping
+    lowered = []
+    for lineno, matched in declarations.items():
+        codes = lambda_codes.get(lineno, ())
+        if len(matched) != 1 or len(codes) != 1:
+            continue
+
+        (node, keyword, identifier), lambda_code = matched[0], codes[0]
+        key = make_key(keyword, identifier, lambda_code)
+        if cache.contains(key):
+            continue
+
+        try:
+            lambdex_node = compile_node(
+                shift_to_keyword(node),
+                ctx=context,
+                flag=ContextFlag.outermost_lambdex,
+            )
+        except SyntaxError:
+            context.frames.clear()
+            continue
+
+        freevars = lambda_code.co_freevars
+        wrapper_node = _make_wrapper(lambdex_node, freevars, context)
+        lowered.append((key, lambdex_node, freevars, wrapper_node))
+
+    if not lowered:
+        return 0
+
+    module_node = ast.Module(
+        body=[wrapper_node for _, _, _, wrapper_node in lowered],
+        type_ignores=[],
+    )
+    module_node = fix_missing_locations(module_node)
+    try:
+        module_code = compile(module_node, filename, "exec")
+    except SyntaxError:
+        return 0
+
+    wrapper_codes = {
+        obj.co_name: obj for obj in module_code.co_consts if inspect.iscode(obj)
+    }
+    entries = {}
+    for key, lambdex_node, freevars, wrapper_node in lowered:
+        lambdex_code, freevars_mapping = _unwrap_code_object(
+            wrapper_codes[wrapper_node.name], lambdex_node, freevars, context, False
+        )
+        entries[key] = (lambdex_code, lambdex_node, freevars_mapping)
+    cache.update(entries)
+    if transpile and globals is not None and "__name__" in globals:
+        transpile_file(globals["__name__"])
+
+    return len(entries)
 
 
 def compile_lambdex(declarer) -> types.FunctionType:
@@ -230,6 +431,11 @@ def compile_lambdex(declarer) -> types.FunctionType:
     Multiple calls with a same declarer yield functions with same code object,
     whilst there closure and globals may be different.
     """
+    if counters.__enabled__ and not counters._state.counting:
+        return counters.count(compile_lambdex, declarer)
+    if profiler._callback is not None and profiler._state.record is None:
+        return profiler.profile(compile_lambdex, declarer)
+
     # If cache hit, simply update metadata and return
     cached_value = cache.get(declarer)
     if cached_value is not None:
@@ -250,4 +456,7 @@ def compile_lambdex(declarer) -> types.FunctionType:
 
     cache.set(declarer, (lambdex_code, lambdex_node, fvmapping))
     transpile_file(lambda_func.__module__)
-    return _wrap_code_object(lambdex_code, lambda_func, lambdex_node, fvmapping)
+    profiler.lap("transpile_file")
+    ret = _wrap_code_object(lambdex_code, lambda_func, lambdex_node, fvmapping)
+    profiler.lap("wrap")
+    return ret
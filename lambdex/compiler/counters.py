@@ -0,0 +1,204 @@
+"""
+Per-call-site counters of lambdex declarations.
+
+A lambdex declared in a function is compiled, or fetched from the cache and
+wrapped, each time the function runs.  When counting is enabled, each call
+site counts its declarations, cache misses and the time spent in
+`compile_lambdex()`, so that hot sites can be found and optimized with
+`asmopt` or `# lambdex: modopt`.
+
+Counting is enabled by `set_enabled(True)`, or by setting envvar LXCOUNTERS
+to a file path, to which a report is written at exit ("-" for stderr).
+"""
+
+from typing import List, Optional
+
+import os
+import sys
+import threading
+from time import perf_counter
+
+from . import cache
+
+__all__ = [
+    "set_enabled",
+    "is_enabled",
+    "reset",
+    "get_sites",
+    "export",
+]
+
+# Number of declarations, above which a site is suggested to be optimized
+HOT_THRESHOLD = 100
+
+# Mapping from declarer keys to sites, updated under `_lock` since lambdexes
+# declared with `def_.lazy` are counted by a background thread
+_sites = {}
+_lock = threading.Lock()
+__enabled__ = False
+
+
+class _State(threading.local):
+    # Whether a declaration is being counted by the current thread
+    counting = False
+
+
+_state = _State()
+
+
+class Site:
+    """
+    Counters of a call site, where `time` is measured in seconds.
+    """
+
+    __slots__ = [
+        "filename",
+        "lineno",
+        "keyword",
+        "identifier",
+        "scope",
+        "calls",
+        "misses",
+        "time",
+    ]
+
+    def __init__(self, declarer):
+        func = declarer.func
+        self.filename = func.__code__.co_filename
+        self.lineno = func.__code__.co_firstlineno
+        self.keyword, self.identifier = declarer.get_key()[:2]
+
+        # Qualified name of the enclosing function, or "" at module level
+        self.scope = func.__qualname__.rpartition(".<locals>.")[0]
+        self.calls = 0
+        self.misses = 0
+        self.time = 0.0
+
+    @property
+    def hint(self) -> str:
+        """
+        Suggest how to eliminate the per-call compilation, if the site is hot.
+        """
+        if self.calls < HOT_THRESHOLD:
+            return ""
+        if not self.scope:
+            return "modopt"
+        name = self.scope.rpartition(".")[2]
+        if name.startswith("<"):
+            return "modopt"
+        return "asmopt " + self.scope
+
+    def as_dict(self) -> dict:
+        ret = {name: getattr(self, name) for name in self.__slots__}
+        ret["hint"] = self.hint
+        return ret
+
+
+def count(compile_func, declarer):
+    """
+    Call `compile_func(declarer)` and update the counters of its site.
+    """
+    missed = cache.get(declarer) is None
+    _state.counting = True
+    start = perf_counter()
+    try:
+        return compile_func(declarer)
+    finally:
+        elapsed = perf_counter() - start
+        _state.counting = False
+        key = declarer.get_key()
+        with _lock:
+            site = _sites.get(key)
+            if site is None:
+                site = _sites[key] = Site(declarer)
+            site.calls += 1
+            site.time += elapsed
+            if missed:
+                site.misses += 1
+
+
+def set_enabled(value: bool):
+    """
+    Enable or disable counting.  The counters are kept when disabled.
+    """
+    global __enabled__
+    __enabled__ = value
+
+
+def is_enabled() -> bool:
+    """
+    Check whether counting is enabled.
+    """
+    return __enabled__
+
+
+def reset():
+    """
+    Clear all counters.
+    """
+    with _lock:
+        _sites.clear()
+
+
+def get_sites() -> List[Site]:
+    """
+    Return the counted sites, the most called first.
+    """
+    with _lock:
+        sites = list(_sites.values())
+    return sorted(sites, key=lambda site: (-site.calls, -site.time))
+
+
+def export(file=None, *, format: str = "text", top: Optional[int] = None):
+    """
+    Write the counters of the `top` most called sites to `file`, either as a
+    text table or as JSON.
+    """
+    file = file or sys.stdout
+    sites = get_sites()[:top]
+    if format == "json":
+        import json
+
+        json.dump([site.as_dict() for site in sites], file, indent=2)
+        file.write("\n")
+        return
+
+    print(
+        "{:>10s} {:>8s} {:>10s} {:>9s}  {:<30s} {}".format(
+            "calls", "misses", "time(ms)", "us/call", "hint", "location"
+        ),
+        file=file,
+    )
+    for site in sites:
+        decl = site.keyword
+        if site.identifier:
+            decl += "." + site.identifier
+        print(
+            "{:>10d} {:>8d} {:>10.2f} {:>9.2f}  {:<30s} {}:{} {}".format(
+                site.calls,
+                site.misses,
+                site.time * 1e3,
+                site.time / site.calls * 1e6,
+                site.hint,
+                site.filename,
+                site.lineno,
+                decl,
+            ),
+            file=file,
+        )
+
+
+def _export_at_exit(path: str):
+    if path == "-":
+        export(sys.stderr)
+        return
+
+    with open(path, "w") as fd:
+        export(fd, format="json" if path.endswith(".json") else "text")
+
+
+if os.getenv("LXCOUNTERS"):
+    import atexit
+
+    set_enabled(True)
+    atexit.register(_export_at_exit, os.getenv("LXCOUNTERS"))
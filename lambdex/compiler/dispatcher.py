@@ -1,5 +1,5 @@
 import ast
-from collections import namedtuple
+from functools import partial
 
 from lambdex._aliases import get_aliases
 from lambdex._features import get_features
@@ -7,50 +7,70 @@ from lambdex._features import get_features
 aliases = get_aliases()
 features = get_features()
 
+from lambdex.keywords import LAZY_IDENTIFIER
 from lambdex.utils.registry import FunctionRegistry
 from .clauses import match_clauses
 from .context import ContextFlag, Context
 
-__all__ = ["Dispatcher"]
+__all__ = [
+    "Dispatcher",
+    "NO_RULE",
+    "get_table",
+    "set_aliases",
+    "find_keyword_free_nodes",
+]
 
-RuleMeta = namedtuple("RuleMeta", ["id", "args"])
-EMPTY_RULE = RuleMeta(None, ())
-Dispatcher = FunctionRegistry("Dispatcher").set_default(lambda *_: EMPTY_RULE)
+# Names that may trigger a rule
+KEYWORDS = frozenset()
+
+# A sentinel returned by dispatch functions if no rule matches the node
+NO_RULE = object()
+
+# Factories of dispatch functions, keyed by node class
+Dispatcher = FunctionRegistry("Dispatcher")
+
+_table = None
 
 
 @Dispatcher.register(ast.Lambda)
-def disp_Lambda(node: ast.Lambda, ctx: Context, flag: ContextFlag):
-    if flag != ContextFlag.outermost_lambdex:
-        return RuleMeta(ast.Lambda, ())
+def disp_Lambda(flag: ContextFlag, bind):
+    if flag == ContextFlag.outermost_lambdex:
+        return None
 
-    return RuleMeta((ast.Lambda, flag), ())
+    return bind(ast.Lambda)
 
 
 @Dispatcher.register(ast.Call)
-def disp_Call(node: ast.Call, ctx: Context, flag: ContextFlag):
-    func = node.func
-
-    if isinstance(func, ast.Name):
-        name = func.id
-        func_name = None
-    elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
-        name = func.value.id
-        func_name = func.attr
-    else:
-        name = None
-        func_name = None
+def disp_Call(flag: ContextFlag, bind):
+    rules = {
+        aliases.def_: bind((ast.FunctionDef, flag)),
+        aliases.async_def_: bind((ast.AsyncFunctionDef, flag)),
+    }
+
+    def _dispatch(node: ast.Call, ctx: Context):
+        func = node.func
+
+        if isinstance(func, ast.Name):
+            rule = rules.get(func.id)
+            func_name = None
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            rule = rules.get(func.value.id)
+            func_name = func.attr if func.attr != LAZY_IDENTIFIER else None
+        else:
+            rule = None
+
+        if rule is None:
+            return NO_RULE
+
+        return rule(node, ctx, func_name)
 
-    ast_type = {
-        aliases.def_: ast.FunctionDef,
-        aliases.async_def_: ast.AsyncFunctionDef,
-    }.get(name)
-    return RuleMeta((ast_type, flag), (func_name,))
+    return _dispatch
 
 
 @Dispatcher.register(ast.Name)
-def disp_Name(node: ast.Name, ctx: Context, flag: ContextFlag):
-    if node.id == aliases.callee_:
-        return RuleMeta("callee", ())
+def disp_Name(flag: ContextFlag, bind):
+    callee_rule = bind("callee")
+    single_keyword_rule = bind("single_keyword_stmt")
 
     if flag == ContextFlag.should_be_expr:
         mapping = {
@@ -65,22 +85,25 @@ def disp_Name(node: ast.Name, ctx: Context, flag: ContextFlag):
             aliases.raise_: ast.Raise,
             aliases.return_: ast.Return,
         }
+    else:
+        mapping = {}
 
-    rule_type = mapping.get(node.id)
+    def _dispatch(node: ast.Name, ctx: Context):
+        if node.id == aliases.callee_:
+            return callee_rule(node, ctx)
 
-    if rule_type is not None:
-        return RuleMeta("single_keyword_stmt", (rule_type,))
+        rule_type = mapping.get(node.id)
+        if rule_type is None:
+            return NO_RULE
 
-    return EMPTY_RULE
+        return single_keyword_rule(node, ctx, rule_type)
 
+    return _dispatch
 
-@Dispatcher.register(ast.Subscript)
-def disp_Subscript(node: ast.Subscript, ctx: Context, flag: ContextFlag):
-    clauses = match_clauses(node, ctx.raise_)
-    if clauses is None:
-        return EMPTY_RULE
 
-    ast_type = {
+@Dispatcher.register(ast.Subscript)
+def disp_Subscript(flag: ContextFlag, bind):
+    ast_types = {
         aliases.return_: ast.Return,
         aliases.if_: ast.If,
         aliases.for_: ast.For,
@@ -96,27 +119,131 @@ def disp_Subscript(node: ast.Subscript, ctx: Context, flag: ContextFlag):
         aliases.async_with_: ast.AsyncWith,
         aliases.await_: ast.Await,
         aliases.del_: ast.Delete,
-    }.get(clauses[0].name)
+    }
+    rules = {name: (ast_type, bind(ast_type)) for name, ast_type in ast_types.items()}
+
+    def _dispatch(node: ast.Subscript, ctx: Context):
+        clauses = match_clauses(node, ctx.raise_)
+        if clauses is None:
+            return NO_RULE
 
-    ctx.check_coroutine(ast_type, clauses[0].node, clauses[0].name)
+        name = clauses[0].name
+        ast_type, rule = rules.get(name, (None, None))
+        if rule is None:
+            return NO_RULE
 
-    return RuleMeta(ast_type, (clauses,))
+        ctx.check_coroutine(ast_type, clauses[0].node, name)
+        return rule(node, ctx, clauses)
+
+    return _dispatch
 
 
 if features.await_attribute:
 
     @Dispatcher.register(ast.Attribute)
-    def disp_Attribute(node: ast.Attribute, ctx: Context, flag: ContextFlag):
-        if node.attr != aliases.await_:
-            return EMPTY_RULE
+    def disp_Attribute(flag: ContextFlag, bind):
+        rule = bind((ast.Await, ast.Attribute))
+
+        def _dispatch(node: ast.Attribute, ctx: Context):
+            if node.attr != aliases.await_:
+                return NO_RULE
 
-        ctx.check_coroutine(ast.Await, node, aliases.await_)
-        return RuleMeta((ast.Await, ast.Attribute), ())
+            ctx.check_coroutine(ast.Await, node, aliases.await_)
+            return rule(node, ctx)
+
+        return _dispatch
 
 
 @Dispatcher.register(ast.Compare)
-def disp_Compare(node: ast.Compare, ctx: Context, flag: ContextFlag):
+def disp_Compare(flag: ContextFlag, bind):
     if flag != ContextFlag.should_be_stmt:
-        return EMPTY_RULE
-
-    return RuleMeta(ast.Assign, ())
+        return None
+
+    return bind(ast.Assign)
+
+
+def _build_table() -> dict:
+    """
+    Build a flat table mapping `(node class, flag)` to a dispatch function
+    `f(node, ctx)`, which compiles `node` with the rule it matches, or returns
+    `NO_RULE` if no rule matches.
+
+    Rules are looked up and bound here once.  A rule that does not depend on
+    the contents of the node is used as the dispatch function directly.
+    """
+    from .rules import Rules
+
+    table = {}
+    bind = partial(Rules.get, default=None)
+    for node_class, factory in Dispatcher.mapping.items():
+        for flag in ContextFlag:
+            dispatch = factory(flag, bind)
+            if dispatch is not None:
+                table[node_class, flag] = dispatch
+
+    return table
+
+
+def set_aliases(new_aliases):
+    """
+    Match keywords with `new_aliases`.  The dispatch table is rebuilt on next
+    `get_table()` unless `new_aliases` are the same as the current ones.
+    """
+    global aliases, KEYWORDS, _table
+
+    if new_aliases == aliases and _table is not None:
+        return
+
+    aliases = new_aliases
+    KEYWORDS = frozenset(
+        value for name, value in aliases._asdict().items() if name[0].islower()
+    )
+    _table = None
+
+
+def get_table() -> dict:
+    """
+    Return the dispatch table for current aliases.
+    """
+    global _table
+
+    if _table is None:
+        _table = _build_table()
+    return _table
+
+
+set_aliases(aliases)
+
+
+def find_keyword_free_nodes(root: ast.AST) -> set:
+    """
+    Return the nodes within `root` whose subtrees contain no names in
+    `KEYWORDS`, which match no rule and are left unchanged if compiled as
+    expressions.  Ordinary lambdas are included as well, since they are never
+    compiled.
+
+    The nodes are walked once with an explicit stack.  Whenever a keyword is
+    met, its ancestors up to the nearest lambda are marked as not free.
+    """
+    await_attr = aliases.await_ if features.await_attribute else None
+    parents = {root: None}
+    not_free = set()
+    todo = [root]
+    while todo:
+        node = todo.pop()
+        cls = node.__class__
+        if (cls is ast.Name and node.id in KEYWORDS) or (
+            cls is ast.Attribute and node.attr == await_attr
+        ):
+            while node is not None and node not in not_free:
+                if node.__class__ is ast.Lambda:
+                    break
+                not_free.add(node)
+                node = parents[node]
+            continue
+
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+            todo.append(child)
+
+    return {node for node in parents if node not in not_free}
@@ -0,0 +1,102 @@
+"""
+Compile lambdexes in the background.
+
+A declaration `def_.lazy(lambda: [...])` returns a `LazyLambdex` at once, while
+the lambdex is compiled by a background thread.  Calling the proxy blocks only
+if the compilation has not finished yet.  Errors raised during compilation,
+such as SyntaxError, are raised on the first call.
+"""
+import os
+import typing
+import threading
+import concurrent.futures
+
+from . import cache
+from .core import compile_lambdex
+
+__all__ = ["LazyLambdex", "compile_lazily"]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class LazyLambdex:
+    """
+    A callable standing for a lambdex being compiled.
+
+    Note that `callee_` within the lambdex refers to the compiled function
+    instead of the proxy.
+    """
+
+    __slots__ = ["_future", "_func"]
+
+    def __init__(self, future: typing.Optional[concurrent.futures.Future], func=None):
+        self._future = future
+        self._func = func
+
+    def resolve(self):
+        """
+        Return the compiled function, blocking until it is available.
+        """
+        func = self._func
+        if func is None:
+            func = self._func = self._future.result()
+        return func
+
+    def done(self) -> bool:
+        """
+        Check whether the compilation has finished.
+        """
+        return self._func is not None or self._future.done()
+
+    def __call__(self, *args, **kwargs):
+        func = self._func
+        if func is None:
+            func = self.resolve()
+        return func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "compiled" if self.done() else "pending"
+        return "<LazyLambdex {} at {:#x}>".format(state, id(self))
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Return the executor, creating it on the first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Compilation holds the GIL, so more threads would not help.
+                # A single thread also keeps declarations of a same key from
+                # being compiled concurrently.
+                _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return _executor
+
+
+def _reset_after_fork():
+    """
+    Drop the executor inherited from the parent, whose thread is not running
+    in the child process.
+    """
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def compile_lazily(declarer):
+    """
+    Schedule the compilation of `declarer` on the background thread, and
+    return a `LazyLambdex`.  If the lambdex has been cached, the function is
+    built at once, since only its closure needs to be rebuilt, and returned
+    as a resolved `LazyLambdex`.
+    """
+    if cache.get(declarer) is not None:
+        return LazyLambdex(None, compile_lambdex(declarer))
+
+    return LazyLambdex(_get_executor().submit(compile_lambdex, declarer))
@@ -0,0 +1,124 @@
+"""
+Opt-in profiling of lambdex declarations.
+
+Once a callback is registered with `set_profiler()`, it is called with a
+`Record` after each call of `compile_lambdex()`, telling where the time of
+the declaration goes.  The declaration being profiled is tracked per
+thread, so that lambdexes compiled by the background thread of `def_.lazy`
+are recorded as well, in which case the callback is called from that thread.
+Profiling costs nothing but a check per declaration when disabled.
+"""
+
+from typing import Callable, Optional
+
+import threading
+from time import perf_counter
+
+from . import cache
+
+__all__ = ["Record", "set_profiler", "get_profiler", "lap"]
+
+# Phases of a cache miss, in the order they happen
+PHASES = (
+    "source",
+    "match",
+    "compile_node",
+    "compile",
+    "rename",
+    "transpile_file",
+    "wrap",
+)
+
+_callback = None
+
+
+class _State(threading.local):
+    # The record of the declaration being compiled, if profiling is enabled
+    record = None
+
+
+_state = _State()
+
+
+class Record:
+    """
+    Timings of a declaration, in seconds.
+
+    `timings` maps each phase in `PHASES` that has been run to its time.  On a
+    cache hit, only the "wrap" phase is run.
+    """
+
+    __slots__ = [
+        "filename",
+        "lineno",
+        "keyword",
+        "identifier",
+        "cache_hit",
+        "timings",
+        "total",
+        "_last",
+    ]
+
+    def __init__(self, declarer, cache_hit: bool):
+        code_obj = declarer.func.__code__
+        self.filename = code_obj.co_filename
+        self.lineno = code_obj.co_firstlineno
+        self.keyword, self.identifier = declarer.get_key()[:2]
+        self.cache_hit = cache_hit
+        self.timings = {}
+        self.total = 0.0
+        self._last = None
+
+    def __repr__(self):
+        return "<Record {}:{} {} {:.1f}us>".format(
+            self.filename,
+            self.lineno,
+            "hit" if self.cache_hit else "miss",
+            self.total * 1e6,
+        )
+
+
+def set_profiler(callback: Optional[Callable[[Record], None]]):
+    """
+    Call `callback` with a `Record` after each declaration.  Pass None to
+    disable profiling.
+    """
+    global _callback
+    _callback = callback
+
+
+def get_profiler() -> Optional[Callable[[Record], None]]:
+    """
+    Return the callback set by `set_profiler()`.
+    """
+    return _callback
+
+
+def lap(phase: str):
+    """
+    Charge the time since the previous lap to `phase` of the declaration
+    being profiled, if any.
+    """
+    record = _state.record
+    if record is not None:
+        now = perf_counter()
+        record.timings[phase] = record.timings.get(phase, 0.0) + now - record._last
+        record._last = now
+
+
+def profile(compile_func, declarer):
+    """
+    Call `compile_func(declarer)` and report the timings to the callback.
+    """
+    callback = _callback
+    previous = _state.record
+    record = _state.record = Record(declarer, cache.get(declarer) is not None)
+    record._last = start = perf_counter()
+    try:
+        return compile_func(declarer)
+    finally:
+        record.total = perf_counter() - start
+        if record.cache_hit:
+            record.timings["wrap"] = record.total
+        _state.record = previous
+        callback(record)
@@ -129,38 +129,40 @@ def r_return(node: ast.Subscript, ctx: Context, clauses: list):
 
 @Rules.register(ast.If)
 def r_if(node: ast.Subscript, ctx: Context, clauses: list):
-    ctx.assert_head(clauses[0])
-    ctx.assert_single_head(clauses[0])
-
-    for clause in clauses[1:-1]:
-        ctx.assert_name_equals(clause, aliases.elif_)
-        ctx.assert_head(clause)
-        ctx.assert_single_head(clause)
-
-    if not clauses.single():
-        clause = clauses[-1]
-        ctx.assert_name_in(clause, (aliases.else_, aliases.elif_))
-        if clause.name == aliases.else_:
-            ctx.assert_no_head(clause)
-        else:
+    # Chains may have hundreds of `elif_` clauses, so that they are checked in
+    # a single pass, and assertions are only made on invalid clauses
+    last = len(clauses) - 1
+    for idx, clause in enumerate(clauses):
+        if 0 < idx < last:
+            if clause.name != aliases.elif_:
+                ctx.assert_name_equals(clause, aliases.elif_)
+        elif idx and idx == last:
+            if clause.name != aliases.elif_:
+                ctx.assert_name_in(clause, (aliases.else_, aliases.elif_))
+                ctx.assert_no_head(clause)
+                continue
+
+        if not clause.single_head():
             ctx.assert_head(clause)
             ctx.assert_single_head(clause)
 
-    curr_node = None
-    prev_orelse = []
-    for clause in clauses[::-1]:
-        if clause.name == aliases.else_:
-            prev_orelse = _compile_stmts(ctx, clause.body)
-            continue
+    # Lower the chain from the last clause, where each `ast.If` becomes the
+    # `orelse` of its previous one
+    branches = clauses
+    orelse = []
+    if last and clauses[last].name == aliases.else_:
+        branches = clauses[:last]
+        orelse = _compile_stmts(ctx, clauses[last].body)
 
-        # if_ or elif_
+    curr_node = None
+    for clause in reversed(branches):
         curr_node = ast.If(
             test=ctx.compile(clause.unwrap_head()),
             body=_compile_stmts(ctx, clause.body),
-            orelse=prev_orelse,
+            orelse=orelse,
         )
         copy_lineinfo(clause.node, curr_node)
-        prev_orelse = [curr_node]
+        orelse = [curr_node]
 
     return curr_node
 
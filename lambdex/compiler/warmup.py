@@ -0,0 +1,60 @@
+"""
+Warm up the compile cache before forking workers.
+
+Pre-fork servers such as gunicorn or uwsgi import the application in a parent
+process, and fork workers afterwards.  Lambdexes declared inside functions are
+compiled lazily, so that each worker compiles them again on its own.  Calling
+`warm_up()` in the parent compiles them beforehand, and the cache is then
+shared by the workers copy-on-write.
+"""
+import gc
+import sys
+import typing
+
+from lambdex.keywords import Declarer
+from .core import compile_file
+
+__all__ = ["warm_up"]
+
+
+def _declares_lambdexes(module) -> bool:
+    """
+    Check whether `module` imports a declarer keyword.
+    """
+    namespace = getattr(module, "__dict__", None)
+    if not isinstance(namespace, dict):
+        return False
+    return any(isinstance(value, Declarer) for value in namespace.values())
+
+
+def warm_up(modules: typing.Optional[typing.Iterable] = None, *, freeze=False) -> int:
+    """
+    Compile the lambdex declarations in `modules` into the cache, and return
+    the number of declarations newly cached.  `modules` defaults to all
+    modules in `sys.modules` that import a declarer keyword and have their
+    source available.
+
+    If `freeze` is True, `gc.freeze()` is called afterwards (Python 3.7+), so
+    that the garbage collector of workers will not touch, and thus copy, the
+    pages holding the cache.
+    """
+    if modules is None:
+        modules = [m for m in list(sys.modules.values()) if _declares_lambdexes(m)]
+
+    num_cached = 0
+    for module in modules:
+        filename = getattr(module, "__file__", None)
+        if not filename or not filename.endswith(".py"):
+            continue
+        try:
+            # The transpiler runs on a thread, which must not be started
+            # right before forking
+            num_cached += compile_file(filename, vars(module), transpile=False)
+        except SyntaxError:
+            # The source was modified after the module was imported
+            continue
+
+    if freeze and hasattr(gc, "freeze"):
+        gc.freeze()
+
+    return num_cached
@@ -7,6 +7,7 @@ from typing import Sequence
 from lambdex.fmt.jobs_meta import JobsMeta
 from lambdex.fmt.core.api import FormatCode
 from lambdex.fmt.utils.logger import getLogger
+from lambdex.fmt.utils.aliases import AliasesCache
 from lambdex.fmt.utils.io import StdinResource, FileResource, _ResourceBase
 
 logger = getLogger(__name__)
@@ -25,6 +26,7 @@ class BaseAdapter(abc.ABC):
     def __init__(self, opts: argparse.Namespace, backend_argv: Sequence[str]):
         self.opts = opts
         self.backend_argv = backend_argv
+        self._aliases_cache = AliasesCache()
 
         self.jobs_meta = self._make_jobs_meta()
 
@@ -39,10 +41,9 @@ class BaseAdapter(abc.ABC):
     def _reset_aliases(self, filename):
         from lambdex.fmt.core.tkutils.rules import matcher
 
-        if filename is None:
-            matcher.reset_aliases()
-        else:
-            matcher.reset_aliases(filename)
+        if not isinstance(filename, str) or filename == "-":
+            filename = None
+        matcher.set_aliases(self._aliases_cache.get(filename))
 
     def _create_resource(self, filename) -> _ResourceBase:
         if filename in {None, "-"}:
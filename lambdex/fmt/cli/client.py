@@ -0,0 +1,58 @@
+"""
+A thin client of `lxfmt --daemon`, accepting the same arguments as lxfmt.
+
+The formatting runs in the daemon if one listens on the socket, and in the
+current process otherwise.
+"""
+import os
+import sys
+import json
+
+from . import daemon
+
+
+def _forward(sock, argv) -> int:
+    request = {
+        "argv": [sys.argv[0]] + list(argv),
+        "cwd": os.getcwd(),
+        "environ": dict(os.environ),
+        "encoding": sys.stdout.encoding or "utf-8",
+        "errors": sys.stdout.errors or "strict",
+    }
+    daemon.send_frame(sock, b"A", json.dumps(request).encode("utf-8"))
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    while True:
+        type, payload = daemon.recv_frame(sock)
+        if type == b"O":
+            sys.stdout.buffer.write(payload)
+        elif type == b"E":
+            sys.stderr.buffer.write(payload)
+        elif type == b"I":
+            daemon.send_frame(sock, b"I", sys.stdin.buffer.read())
+        elif type == b"X":
+            sys.stdout.buffer.flush()
+            sys.stderr.buffer.flush()
+            return int(payload)
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    try:
+        sock = daemon.connect(daemon.default_socket_path())
+    except OSError:
+        from .main import main as run_in_process
+
+        return run_in_process(argv)
+
+    with sock:
+        try:
+            return _forward(sock, argv)
+        except ConnectionError as exc:
+            print("lxfmt-client: lost the daemon: {}".format(exc), file=sys.stderr)
+            return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+A long-running lxfmt server listening on a Unix socket.
+
+Starting lxfmt costs far more than formatting a typical file, as the
+interpreter starts, the formatter pipeline and the backend modules are
+imported, and the rule tables are built on every invocation.  The daemon
+keeps all of them in memory, and `lxfmt-client` forwards its command line,
+working directory, environment and stdin to it.
+
+Messages in both directions are frames of a type byte, a 4-byte big-endian
+length and the payload:
+
+    A  client -> server  JSON of argv, cwd, environ and the stdout encoding
+    I  server -> client  request for the content of stdin (empty payload)
+    I  client -> server  content of stdin
+    O  server -> client  bytes written to stdout
+    E  server -> client  bytes written to stderr
+    X  server -> client  exit code, after which the connection is closed
+
+Only light modules of the standard library are imported at the top level,
+so that the client starts fast.
+"""
+from typing import Optional, Sequence, Tuple
+
+import io
+import os
+import sys
+import json
+import socket
+import struct
+import signal
+
+_HEADER = struct.Struct(">cI")
+
+# Maximum size of an outgoing frame, larger writes are split
+_CHUNK_SIZE = 1 << 20
+
+SOCKET_ENV = "LXFMT_SOCKET"
+
+
+def default_socket_path() -> str:
+    """
+    Return the socket path from `$LXFMT_SOCKET`, or a per-user default in
+    `$XDG_RUNTIME_DIR` or the temporary directory.
+    """
+    path = os.getenv(SOCKET_ENV)
+    if path:
+        return path
+
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "lxfmt.sock")
+
+    import tempfile
+
+    return os.path.join(
+        tempfile.gettempdir(), "lxfmt-{}".format(os.getuid()), "lxfmt.sock"
+    )
+
+
+def send_frame(sock: socket.socket, type: bytes, payload: bytes = b""):
+    for start in range(0, max(len(payload), 1), _CHUNK_SIZE):
+        chunk = payload[start : start + _CHUNK_SIZE]
+        sock.sendall(_HEADER.pack(type, len(chunk)) + chunk)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, _CHUNK_SIZE))
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[bytes, bytes]:
+    type, size = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return type, _recv_exactly(sock, size)
+
+
+def connect(path: str) -> socket.socket:
+    """
+    Connect to the daemon at `path`.  The socket must be owned by the current
+    user, or the request would be sent to someone else's process.
+    """
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError("{} is not owned by the current user".format(path))
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class _RemoteWriter(io.RawIOBase):
+    """
+    A binary stream sending whatever is written as frames of `type`.
+    """
+
+    def __init__(self, sock: socket.socket, type: bytes):
+        self._sock = sock
+        self._type = type
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        send_frame(self._sock, self._type, bytes(data))
+        return len(data)
+
+
+class _RemoteStdin:
+    """
+    A stand-in for `sys.stdin`, fetching the content of the client's stdin
+    only when it is read.
+    """
+
+    closed = False
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._exhausted = False
+
+    @property
+    def buffer(self):
+        return self
+
+    def read(self, size: int = -1) -> bytes:
+        if self._exhausted:
+            return b""
+        self._exhausted = True
+
+        send_frame(self._sock, b"I")
+        type, payload = recv_frame(self._sock)
+        if type != b"I":
+            raise ConnectionError("unexpected frame {!r}".format(type))
+        return payload
+
+
+def _text_writer(sock: socket.socket, type: bytes, encoding: str, errors: str):
+    return io.TextIOWrapper(
+        io.BufferedWriter(_RemoteWriter(sock, type)),
+        encoding=encoding,
+        errors=errors,
+        newline="\n",
+    )
+
+
+def _serve_request(sock: socket.socket) -> int:
+    """
+    Run lxfmt for the request on `sock` in the environment of the client,
+    with the standard streams forwarded to it.  Return the exit code.
+    """
+    from .main import main
+
+    type, payload = recv_frame(sock)
+    if type != b"A":
+        raise ConnectionError("unexpected frame {!r}".format(type))
+    request = json.loads(payload.decode("utf-8"))
+
+    saved_cwd = os.getcwd()
+    saved_environ = dict(os.environ)
+    saved_argv = sys.argv
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+
+    encoding, errors = request["encoding"], request["errors"]
+    sys.argv = request["argv"]
+    sys.stdin = _RemoteStdin(sock)
+    sys.stdout = _text_writer(sock, b"O", encoding, errors)
+    sys.stderr = _text_writer(sock, b"E", encoding, "backslashreplace")
+    try:
+        os.environ.clear()
+        os.environ.update(request["environ"])
+        os.chdir(request["cwd"])
+
+        try:
+            code = main(sys.argv[1:], allow_parallel=False)
+        except SystemExit as exc:
+            code = exc.code
+        except Exception:
+            import traceback
+
+            traceback.print_exc()
+            code = 1
+
+        if code is None:
+            code = 0
+        elif not isinstance(code, int):
+            print(code, file=sys.stderr)
+            code = 1
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        sys.argv = saved_argv
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+    return code
+
+
+def _handle_connection(sock: socket.socket):
+    try:
+        code = _serve_request(sock)
+        send_frame(sock, b"X", str(code).encode("ascii"))
+    except (OSError, ValueError, KeyError, struct.error):
+        # The client is gone or talks nonsense, nothing can be reported
+        pass
+
+
+def _prepare_socket_path(path: str):
+    """
+    Create the directory of `path` if needed, and remove a stale socket left
+    by a dead daemon.
+
+    The directory must be private to the current user, or another user could
+    replace the socket.  PermissionError is raised otherwise.
+    """
+    import stat
+
+    from lambdex.fmt.utils.logger import getLogger
+
+    logger = getLogger(__name__)
+
+    dirname = os.path.dirname(os.path.abspath(path))
+    if not os.path.lexists(dirname):
+        os.makedirs(dirname, mode=0o700)
+
+    dir_stat = os.lstat(dirname)
+    if (
+        not stat.S_ISDIR(dir_stat.st_mode)
+        or dir_stat.st_uid != os.getuid()
+        or dir_stat.st_mode & 0o077
+    ):
+        raise PermissionError(
+            "{} must be a directory owned by the current user and not "
+            "accessible by others".format(dirname)
+        )
+
+    if os.path.lexists(path):
+        if os.lstat(path).st_uid != os.getuid():
+            logger.error("{} is not owned by the current user".format(path))
+        try:
+            connect(path).close()
+        except OSError:
+            os.unlink(path)
+        else:
+            logger.error("another daemon is listening on {}".format(path))
+
+
+def _warm_up():
+    """
+    Import the adapters and the formatter pipeline, and build the rule tables
+    ahead of the first request.
+    """
+    from io import BytesIO
+
+    from lambdex.fmt import adapters
+    from lambdex.fmt.core.api import FormatCode
+    from lambdex.fmt.core.tkutils.rules import matcher
+
+    matcher.reset_aliases()
+    FormatCode(BytesIO(b"f = def_(lambda: [pass_])\n").readline)
+
+
+def serve(path: str):
+    """
+    Serve lxfmt requests on the Unix socket at `path` until terminated.
+    Requests are served one at a time, as each of them changes the working
+    directory and the environment of the process.
+    """
+    _prepare_socket_path(path)
+    _warm_up()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+
+    def _terminate(signum, frame):
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.listen(16)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                _handle_connection(conn)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(path)
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        "lxfmt --daemon",
+        description="Serve lxfmt requests from lxfmt-client on a Unix socket",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        default=None,
+        help="path of the socket (default: $LXFMT_SOCKET, or a per-user path)",
+    )
+    return parser
+
+
+def serve_main(argv: Optional[Sequence[str]] = None) -> int:
+    opts = build_parser().parse_args(argv)
+    serve(opts.socket or default_socket_path())
+    return 0
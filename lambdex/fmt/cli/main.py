@@ -1,17 +1,25 @@
 import sys
+from typing import Optional, Sequence
 
 from lambdex.fmt import adapters
 from .opts import split_argv, build_parser
 
 
-def main() -> int:
-    backend_argv, argv = split_argv()
+def main(argv: Optional[Sequence[str]] = None, *, allow_parallel=True) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["--daemon"]:
+        from .daemon import serve_main
+
+        return serve_main(argv[1:])
+
+    backend_argv, argv = split_argv(argv)
     opts = build_parser().parse_args(argv)
 
     adapter = adapters.build(opts.adapter, opts, backend_argv)
 
     changed = False
-    if adapter.jobs_meta.parallel:
+    if adapter.jobs_meta.parallel and allow_parallel:
         import multiprocessing
         import concurrent.futures
 
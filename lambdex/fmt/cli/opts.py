@@ -1,3 +1,5 @@
+from typing import Optional, Sequence
+
 import sys
 import argparse
 
@@ -9,8 +11,10 @@ logger = getLogger(__name__)
 DELIMITTER = "--"
 
 
-def split_argv():
-    argv = sys.argv[1:]
+def split_argv(argv: Optional[Sequence[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    argv = list(argv)
     idx_delimitters = [i for i, arg in enumerate(argv) if arg == DELIMITTER]
     num_delimitters = len(idx_delimitters)
     if num_delimitters > 2:
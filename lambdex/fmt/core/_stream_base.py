@@ -11,31 +11,37 @@ class _StreamBase(abc.ABC):
         self.buffering = False
         self.last_token = TokenInfo.fake
         self.buffer = []
-        self.action = actions.Default()
+        self.action = actions.default
 
         self.tokenseq = tokenseq
 
+        # Table for dispatching actions by their classes
+        self._action_handlers = {
+            actions.Default: self._handle_default,
+            actions.StartBuffer: self._handle_start_buffer,
+            actions.StopBuffer: self._handle_stop_buffer,
+        }
+
         self._init()
 
     def _init(self):
         pass
 
     def __iter__(self):
-        def _stream():
-            token = None
-            iterator = iter(self.tokenseq)
-            while True:
-                if not self.action.dont_consume:
-                    try:
-                        token = next(iterator)
-                    except StopIteration:
-                        break
-                yield token
-
-        for token in _stream():
-            self.action = actions.Default()
-            yield from self._handle_token(token)
-            self.action = actions.BaseAction.from_(self.action)
+        token = None
+        iterator = iter(self.tokenseq)
+        handle_token = self._handle_token
+        while True:
+            if not self.action.dont_consume:
+                try:
+                    token = next(iterator)
+                except StopIteration:
+                    break
+
+            self.action = actions.default
+            yield from handle_token(token)
+            if self.action is None:
+                self.action = actions.default
             yield from self._handle_action(token, self.action)
 
     @abc.abstractmethod
@@ -49,15 +55,10 @@ class _StreamBase(abc.ABC):
     def _handle_action(
         self, token: TokenInfo, action: actions.BaseAction
     ) -> Sequence[TokenInfo]:
-
-        if actions.Default.is_class_of(action):
-            yield from self._handle_default(token)
-        elif actions.StartBuffer.is_class_of(action):
-            yield from self._handle_start_buffer(token)
-        elif actions.StopBuffer.is_class_of(action):
-            yield from self._handle_stop_buffer(token)
-        else:
-            yield from self._handle_unknown_action(token, action)
+        handler = self._action_handlers.get(action.__class__)
+        if handler is None:
+            return self._handle_unknown_action(token, action)
+        return handler(token)
 
     def _append_buffer(self, token):
         self.buffer.append(token)
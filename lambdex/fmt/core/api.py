@@ -1,10 +1,78 @@
+from typing import Optional, Tuple
+
+from io import BytesIO
+
+from . import ranges
 from .tkutils.tokenize import tokenize
+from .tkutils.ctokenize import CTokenizeError
+from .tkutils.rules import matcher
+from .tkutils.builtins.tokenize import detect_encoding
 from .transforms import transform, AsCode
 
 
-def FormatCode(source):
+def FormatCode(source, lines: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Format the code read by `source`, a readline-like callable.
+
+    If `lines` is given as a `(first, last)` pair of 1-based line numbers,
+    only the top-level statements overlapping the range are formatted, and
+    other statements are kept verbatim.
+    """
+
+    content = b"".join(iter(source, b""))
+
+    # Fast path: a file with no declarer can not contain any lambdex, and the
+    # pipeline below would reproduce it verbatim.
+    if not matcher.may_contain_declarer(content):
+        encoding, _ = detect_encoding(BytesIO(content).readline)
+        return content.decode(encoding)
+
+    if lines is not None:
+        output = _format_lines(content, *lines)
+        if output is not None:
+            return output
+
+    return _format(content)
+
+
+def _format_lines(content: bytes, first: int, last: int) -> Optional[str]:
+    """
+    Format top-level statements of `content` overlapping lines `first` to
+    `last`.  Return None if the source can not be split into statements.
+    """
+    encoding, _ = detect_encoding(BytesIO(content).readline)
+    # Statements are formatted on their own, without the coding cookie
+    if encoding not in ("utf-8", "utf-8-sig"):
+        return None
+
+    chunks = ranges.locate(content, first, last)
+    if chunks is None:
+        return None
+    elif not chunks:
+        return content.decode(encoding)
+
+    output = [content[: chunks[0].begin].decode(encoding)]
+    for chunk in chunks:
+        code = content[chunk.begin : chunk.stop]
+        if chunk.disabled:
+            output.append(code.decode(encoding))
+        else:
+            output.append(_format(code))
+    output.append(content[chunks[-1].stop :].decode(encoding))
+
+    return "".join(output)
+
+
+def _format(content: bytes) -> str:
+    try:
+        return _run_pipeline(content)
+    except CTokenizeError:
+        # The vendored tokenizer is more lenient with malformed sources
+        return _run_pipeline(content, use_ctokenize=False)
+
 
-    seq = tokenize(source)
+def _run_pipeline(content: bytes, **kwargs) -> str:
+    seq = tokenize(BytesIO(content).readline, **kwargs)
     output = AsCode(transform(seq))
 
     return output
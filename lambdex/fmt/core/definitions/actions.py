@@ -1,21 +1,6 @@
-from lambdex.fmt.core.definitions import State
-
-
 class BaseAction:
 
-    __slots__ = ["dont_consume", "dont_store", "dont_yield_buffer"]
-
-    @classmethod
-    def is_class_of(cls, action):
-        return action.__class__ is cls
-
-    @classmethod
-    def from_(cls, value) -> "BaseAction":
-        if value is None:
-            return Default()
-
-        assert isinstance(value, BaseAction)
-        return value
+    __slots__ = ["dont_consume", "dont_store", "dont_yield_buffer", "no_special"]
 
     def __init__(
         self,
@@ -27,10 +12,7 @@ class BaseAction:
         self.dont_consume = dont_consume
         self.dont_store = dont_store
         self.dont_yield_buffer = dont_yield_buffer
-
-    @property
-    def no_special(self):
-        return not (self.dont_consume or self.dont_store)
+        self.no_special = not (dont_consume or dont_store)
 
     def __repr__(self):
         attrs = ("{}={}".format(name, getattr(self, name)) for name in self.__slots__)
@@ -52,19 +34,16 @@ class StopBuffer(BaseAction):
     pass
 
 
-class Backtrace(BaseAction):
-
-    __slots__ = BaseAction.__slots__ + ["new_state"]
-
-    def state(self, new_state: State) -> "Backtrace":
-        self.new_state = new_state
-        return self
-
-
-# default = BaseAction()
-# dont_store = BaseAction()
-# start_buffer = BaseAction()
-# stop_buffer = BaseAction()
-# dont_consume = BaseAction()
-# stop_buffer_and_dont_consume = BaseAction()
-# stop_buffer_and_dont_store = BaseAction()
+# Shared instances for the flag combinations used by rules and transforms.
+# They are returned for every token, and therefore must never be mutated.
+default = Default()
+dont_consume = Default(dont_consume=True)
+dont_store = Default(dont_store=True)
+start_buffer = StartBuffer()
+stop_buffer = StopBuffer()
+stop_buffer_and_dont_consume = StopBuffer(dont_consume=True)
+stop_buffer_and_dont_store = StopBuffer(dont_store=True)
+stop_buffer_and_dont_yield_buffer = StopBuffer(dont_yield_buffer=True)
+stop_buffer_and_dont_yield_buffer_or_store = StopBuffer(
+    dont_yield_buffer=True, dont_store=True
+)
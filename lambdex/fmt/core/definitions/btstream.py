@@ -1,30 +1,43 @@
-from typing import List, Sequence, Optional
+from typing import Sequence, Optional
 
 from collections import deque
 
 from lambdex.fmt.utils.logger import getLogger
 
+from . import token as tk
 from .token_info import TokenInfo
 
 logger = getLogger(__name__)
 
+OPENING_BRACKETS = frozenset([tk.LPAR, tk.LSQB, tk.LBRACE])
+CLOSING_BRACKETS = frozenset([tk.RPAR, tk.RSQB, tk.RBRACE])
+
 
 class BufferFrame:
-    __slots__ = ["is_backtracing", "buffer"]
+    __slots__ = ["buffer"]
 
     def __init__(self):
-        self.is_backtracing = False
         self.buffer = deque()
 
 
 class BTStream:
+    """
+    A token stream that can hold back tokens in a buffer, and look ahead for
+    the token following a bracket pair.
+    """
+
     def __init__(self, tokenseq: Sequence[TokenInfo]):
         self.stack = []
-        self._backtrace_invoked = False
         self.tokenseq = iter(tokenseq)
 
+        # Tokens read from `tokenseq` by lookahead, but not yielded yet
+        self._lookahead = deque()
+        # Mapping from id of an LSQB to whether its RSQB is followed by an LSQB
+        self._followed_by_lsqb = {}
+        self._last_token = None
+
     def start_buffer(self):
-        assert not self.stack or self.stack[-1].is_backtracing
+        assert not self.stack
         logger.debug("== Start Buffer ==")
         self.stack.append(BufferFrame())
 
@@ -37,51 +50,73 @@ class BTStream:
                 logger.debug(repr(token))
         self.stack.pop()
 
-    def backtrace(self):
-        self.stack[-1].is_backtracing = True
-        self._backtrace_invoked = True
-
-        if logger.is_debug:
-            logger.debug("")
-            logger.debug("Backtracing!")
-            for token in self.stack[-1].buffer:
-                logger.debug("{}".format(token))
-            logger.debug("")
-
     def last_is_buffering(self) -> bool:
-        return self.stack and not self.stack[-1].is_backtracing
-
-    def _last_bt_frame(self) -> BufferFrame:
-        for idx in range(len(self.stack) - 1, -1, -1):
-            if self.stack[idx].is_backtracing:
-                return self.stack[idx]
+        return bool(self.stack)
+
+    def _read_ahead(self):
+        """
+        Yield tokens after the last yielded one, reading from `tokenseq` if
+        necessary.
+        """
+        yield from list(self._lookahead)
+        for token in self.tokenseq:
+            self._lookahead.append(token)
+            yield token
 
-        return None
+    def is_followed_by_lsqb(self, lsqb: TokenInfo) -> bool:
+        """
+        Check whether the bracket pair opened by `lsqb`, which should be the
+        last yielded token, is directly followed by another LSQB, ignoring
+        whitespaces, newlines and comments in between.
+
+        While scanning, the results for all bracket pairs nested in `lsqb` are
+        memorized, so that each token is scanned only once however deep
+        the nesting is.
+        """
+        assert lsqb is self._last_token
+        key = id(lsqb)
+        if key in self._followed_by_lsqb:
+            return self._followed_by_lsqb.pop(key)
+
+        opened = [lsqb]
+        closed = []
+        for token in self._read_ahead():
+            if token.is_WS_NL_CMT:
+                continue
+
+            exact_type = token.exact_type
+            if closed:
+                for t in closed:
+                    self._followed_by_lsqb[id(t)] = exact_type == tk.LSQB
+                closed.clear()
+                if key in self._followed_by_lsqb:
+                    break
+
+            if exact_type in OPENING_BRACKETS:
+                opened.append(token)
+            elif exact_type in CLOSING_BRACKETS and opened:
+                t = opened.pop()
+                if t.exact_type == tk.LSQB:
+                    closed.append(t)
+
+        # Reaching the end of stream, no LSQB follows
+        for t in closed:
+            self._followed_by_lsqb[id(t)] = False
+
+        return self._followed_by_lsqb.pop(key, False)
 
     def _get_next_token(self) -> Optional[TokenInfo]:
-        frame = self._last_bt_frame()
-        if frame is None:
-            try:
-                token = next(self.tokenseq)
-            except StopIteration:
-                return None
-        elif frame.buffer:
-            token = frame.buffer.popleft()
-
-        if frame is not None and not frame.buffer:
-            if frame is not self.stack[-1]:
-                logger.debug("ERROR: frame is not at the last")
-                for idx, frame in enumerate(self.stack):
-                    logger.debug(
-                        "== Frame {}: backtracing: {}".format(idx, frame.is_backtracing)
-                    )
-                    for token in frame.buffer:
-                        logger.debug(repr(token))
-                    logger.debug("== End of Frame {}".format(idx))
-                raise RuntimeError
-
-            self.stack.remove(frame)
+        # Results are only queried for the last yielded token. Drop the stale
+        # one, so that the id can not be confused with a new token.
+        if self._last_token is not None:
+            self._followed_by_lsqb.pop(id(self._last_token), None)
+
+        if self._lookahead:
+            token = self._lookahead.popleft()
+        else:
+            token = next(self.tokenseq, None)
 
+        self._last_token = token
         return token
 
     def __iter__(self):
@@ -94,6 +129,5 @@ class BTStream:
 
             yield token
 
-            if self.last_is_buffering() or self._backtrace_invoked:
+            if self.last_is_buffering():
                 self.stack[-1].buffer.append(token)
-                self._backtrace_invoked = False
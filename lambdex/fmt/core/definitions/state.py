@@ -26,16 +26,8 @@ class State(enum.Enum):
     EXPECT_CLS_BODY_LSQB = auto()
     EXPECT_SUBCLS_DOT = auto()
     EXPECT_SUBCLS_NAME = auto()
-    MUST_SUBCLS_DOT_WITH_HEAD = auto()
-    MUST_SUBCLS_DOT_WITH_BODY = auto()
-
-    MUST_SUBCLS_NAME_WITH_HEAD = auto()
-    MUST_SUBCLS_NAME_WITH_BODY = auto()
 
     EXPECT_CLS_HEAD_OR_BODY_LSQB = auto()
-    EXPECT_CLS_HEAD_OR_BODY_RSQB = auto()
-
-    EXPECT_CLS_MAYBE_BODY_LSQB = auto()
 
     EXPECT_AUGASSIGN_DASH = auto()
     EXPECT_AUGASSIGN_ASSIGN = auto()
@@ -0,0 +1,228 @@
+"""
+Locate the top-level statements overlapping a line range, so that they can be
+formatted without processing the whole file.
+
+The tokenizer state is clean at the start of a top-level statement, so that
+scanning can resume from any statement start found by a previous scan, as
+long as the source before it is unchanged.  The starts found in the last
+scanned source are kept, along with the part of the source they were found
+in, which makes repeated formatting of an edited buffer cost in proportion to
+the edit rather than the file.
+"""
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from io import BytesIO
+from collections import namedtuple
+
+from .definitions import tk, TokenInfo
+from .tkutils import ctokenize
+from .tkutils.builtins import tokenize as bltokenize
+
+OPENING_BRACKETS = frozenset([tk.LPAR, tk.LSQB, tk.LBRACE])
+CLOSING_BRACKETS = frozenset([tk.RPAR, tk.RSQB, tk.RBRACE])
+
+# Start of a statement at line `row` and byte `offset`. `disabled` tells
+# whether formatting is turned off by an `lxfmt: off` directive.
+Start = namedtuple("Start", "row offset disabled")
+
+
+class Chunk:
+    """
+    Lines `start` to `end` (exclusive) of a source, spanning bytes `begin` to
+    `stop`, which can be formatted independently of the rest of the file.
+    """
+
+    __slots__ = ["start", "end", "begin", "stop", "disabled"]
+
+    def __init__(self, start: Start, end: Start):
+        self.start = start.row
+        self.end = end.row
+        self.begin = start.offset
+        self.stop = end.offset
+        self.disabled = start.disabled
+
+
+class _CannotSplit(Exception):
+    pass
+
+
+class _LineReader:
+    """
+    Read lines of `content` from `offset` on, recording the offset of each row.
+    """
+
+    __slots__ = ["_stream", "offsets"]
+
+    def __init__(self, content: bytes, offset: int):
+        self._stream = BytesIO(content)
+        self._stream.seek(offset)
+        self.offsets = [offset]
+
+    def readline(self) -> bytes:
+        line = self._stream.readline()
+        if line:
+            self.offsets.append(self.offsets[-1] + len(line))
+        return line
+
+
+def _statement_starts(tokenseq: Iterable[TokenInfo], disabled: bool) -> Iterator:
+    """
+    Yield `(row, disabled)` pairs, where `row` starts a top-level statement or
+    an `lxfmt:` directive between top-level statements.
+
+    Raise `_CannotSplit` if the source does not tokenize, or it contains a
+    directive elsewhere.
+    """
+    depth = indent = 0
+    at_line_start = True
+    in_decorator = False
+    after_directive = False
+
+    try:
+        for token in tokenseq:
+            type = token.type
+            if type in (tk.ENCODING, tk.WHITESPACE, tk.NL):
+                continue
+            elif type == tk.INDENT:
+                indent += 1
+            elif type == tk.DEDENT:
+                indent -= 1
+            elif type == tk.ENDMARKER:
+                break
+            elif type == tk.NEWLINE:
+                at_line_start = True
+            elif type == tk.COMMENT:
+                directive = token.lxfmt_directive()
+                if directive is None:
+                    continue
+                if depth or token.start[1] or not at_line_start:
+                    raise _CannotSplit
+                disabled = directive == "off"
+                yield token.start[0], disabled
+                after_directive = True
+            else:
+                if at_line_start:
+                    at_line_start = False
+                    if indent:
+                        if after_directive:
+                            raise _CannotSplit
+                    elif not in_decorator:
+                        yield token.start[0], disabled
+                    after_directive = False
+                    in_decorator = token.string == "@" and not indent
+
+                exact_type = token.exact_type
+                if exact_type in OPENING_BRACKETS:
+                    depth += 1
+                elif exact_type in CLOSING_BRACKETS:
+                    depth -= 1
+    except (bltokenize.TokenError, SyntaxError):
+        raise _CannotSplit from None
+
+
+def _scan(content: bytes, resume: Start, last: int, tokenize: Callable) -> List[Start]:
+    """
+    Return starts of statements in `content` from `resume` on, up to the first
+    one after line `last`.  If the end of file is reached first, a start at
+    the end of file is appended.
+    """
+    reader = _LineReader(content, resume.offset)
+    tokenseq = tokenize(reader.readline)
+    starts = [resume]
+    for row, disabled in _statement_starts(tokenseq, resume.disabled):
+        if row == 1:
+            # A directive on the first line
+            starts[0] = Start(resume.row, resume.offset, disabled)
+            continue
+        start = Start(row + resume.row - 1, reader.offsets[row - 1], disabled)
+        starts.append(start)
+        if start.row > last:
+            return starts
+
+    num_rows = len(reader.offsets) - 1
+    starts.append(Start(resume.row + num_rows, len(content), None))
+    return starts
+
+
+def _common_prefix_length(a: bytes, b: bytes, block: int = 1 << 16) -> int:
+    limit = min(len(a), len(b))
+    lo = 0
+    while lo < limit and a[lo : lo + block] == b[lo : lo + block]:
+        lo += block
+    if lo >= limit:
+        return limit
+
+    # The common prefix ends within the block, find it by bisection
+    hi = lo + block
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+# Statement starts found by the last scan, and the source up to the end of the
+# line of the last start.  The pair is read and replaced as a whole, so that
+# concurrent callers never mix up the starts of different sources.
+_last_scan = (b"", [])
+
+
+def _known_starts(content: bytes) -> List[Start]:
+    """
+    Return statement starts from the last scan that are still valid in
+    `content`, i.e., whose whole first line is unchanged.
+    """
+    last_content, last_starts = _last_scan
+    known = []
+    prefix = _common_prefix_length(last_content, content)
+    for start in last_starts:
+        end_of_line = content.find(b"\n", start.offset)
+        if not 0 <= end_of_line < prefix:
+            break
+        known.append(start)
+
+    if not known:
+        known.append(Start(1, 0, False))
+    return known
+
+
+def locate(content: bytes, first: int, last: int) -> Optional[List[Chunk]]:
+    """
+    Return chunks of top-level statements in `content` overlapping lines
+    `first` to `last`.  Return None if the source can not be split safely.
+    """
+    global _last_scan
+
+    known = _known_starts(content)
+    resume = known[0]
+    for start in known:
+        if start.row > first:
+            break
+        resume = start
+
+    try:
+        try:
+            if not ctokenize.AVAILABLE:
+                raise ctokenize.CTokenizeError
+            scanned = _scan(content, resume, last, ctokenize.tokenize)
+        except ctokenize.CTokenizeError:
+            scanned = _scan(content, resume, last, bltokenize.tokenize)
+    except _CannotSplit:
+        return None
+
+    starts = [start for start in known if start.row < resume.row] + scanned
+    if starts[-1].disabled is None:
+        starts.pop()
+    end_of_line = content.find(b"\n", starts[-1].offset)
+    if end_of_line < 0:
+        _last_scan = content, starts
+    else:
+        _last_scan = content[: end_of_line + 1], starts
+
+    return [
+        Chunk(start, end)
+        for start, end in zip(scanned, scanned[1:])
+        if start.row <= last and first < end.row
+    ]
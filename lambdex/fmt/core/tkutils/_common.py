@@ -0,0 +1,16 @@
+"""
+Helpers shared by the tokenizers.
+"""
+
+# Shared strings for runs of spaces, which make up most whitespace tokens
+_SPACES = tuple(" " * n for n in range(81))
+
+
+def _slice_whitespace(line: str, start: int, end: int) -> str:
+    """
+    Return `line[start:end]`, reusing a shared string if it consists of spaces.
+    """
+    length = end - start
+    if length < len(_SPACES) and line.startswith(_SPACES[length], start):
+        return _SPACES[length]
+    return line[start:end]
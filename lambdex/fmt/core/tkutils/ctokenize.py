@@ -0,0 +1,194 @@
+"""
+A tokenizer built on the C tokenizer that backs `tokenize` since CPython 3.12.
+
+It yields the same tokens as `builtins.tokenize` followed by `AddWhitespace`,
+with whitespace tokens computed inline.  Where the C tokenizer is not
+available, `AVAILABLE` is False and callers should use the vendored one.
+"""
+from typing import Callable, Iterator, List
+
+import token as _stdlib_token
+import itertools
+
+from lambdex.fmt.core.definitions import TokenInfo, tk
+
+from ._common import _slice_whitespace
+from .builtins.tokenize import detect_encoding
+
+try:
+    from _tokenize import TokenizerIter as _TokenizerIter
+
+    _TokenizerIter(iter(()).__next__, extra_tokens=True)
+except (ImportError, TypeError):
+    _TokenizerIter = None
+
+AVAILABLE = _TokenizerIter is not None
+
+__all__ = ["AVAILABLE", "CTokenizeError", "tokenize"]
+
+# Mapping from token types of the running interpreter to lambdex ones
+_TYPE_MAP = {
+    value: getattr(tk, name)
+    for value, name in _stdlib_token.tok_name.items()
+    if hasattr(tk, name)
+}
+
+_FSTRING_START = getattr(_stdlib_token, "FSTRING_START", None)
+_FSTRING_END = getattr(_stdlib_token, "FSTRING_END", None)
+
+
+class CTokenizeError(Exception):
+    """
+    Raised when the C tokenizer rejects the source.  The vendored tokenizer is
+    more lenient (e.g., it yields ERRORTOKEN), so callers may retry with it.
+    """
+
+
+class _Lines:
+    """
+    Decoded physical lines read by the C tokenizer, indexed by row.
+
+    Only lines from `base` on are kept, so that the memory stays bounded by
+    the longest token rather than the size of the file.
+    """
+
+    __slots__ = ["_readline", "_encoding", "lines", "base"]
+
+    def __init__(self, readline: Callable[[], bytes], encoding: str):
+        self._readline = readline
+        self._encoding = encoding
+        self.lines = []  # type: List[str]
+        self.base = 1
+
+    def readline(self) -> str:
+        line = self._readline().decode(self._encoding)
+        if line:
+            self.lines.append(line)
+        return line
+
+    def __getitem__(self, row: int) -> str:
+        index = row - self.base
+        if 0 <= index < len(self.lines):
+            return self.lines[index]
+        return ""
+
+    def join(self, start_row: int, end_row: int) -> str:
+        return "".join(self.lines[start_row - self.base : end_row - self.base + 1])
+
+    def release(self, row: int):
+        """
+        Drop lines before `row`.
+        """
+        count = row - self.base
+        if count > 0:
+            del self.lines[:count]
+            self.base = row
+
+
+def _raw_tokens(lines: _Lines) -> Iterator[tuple]:
+    """
+    Yield `(type, string, start, end)` of tokens, with f-strings merged
+    into single STRING tokens as the vendored tokenizer does.
+    """
+    fstring_depth = 0
+    fstring_start = None
+    try:
+        for type, string, start, end, _ in _TokenizerIter(
+            lines.readline, extra_tokens=True
+        ):
+            if fstring_depth:
+                if type == _FSTRING_START:
+                    fstring_depth += 1
+                elif type == _FSTRING_END:
+                    fstring_depth -= 1
+                    if not fstring_depth:
+                        # Slice the source, as FSTRING_MIDDLE tokens do not
+                        # preserve escaped braces
+                        source = lines.join(fstring_start[0], end[0])
+                        stop = len(source) - len(lines[end[0]]) + end[1]
+                        string = source[fstring_start[1] : stop]
+                        yield tk.STRING, string, fstring_start, end
+                continue
+
+            if type == _FSTRING_START:
+                fstring_depth = 1
+                fstring_start = start
+                continue
+
+            yield _TYPE_MAP[type], string, start, end
+    except SyntaxError as exc:
+        raise CTokenizeError(exc) from None
+
+
+def tokenize(readline: Callable[[], bytes]) -> Iterator[TokenInfo]:
+    """
+    Tokenize the bytes returned by `readline`, yielding an ENCODING token,
+    then all tokens of the source including synthesized WHITESPACE tokens.
+    """
+    encoding, consumed = detect_encoding(readline)
+    if encoding == "utf-8-sig":
+        # BOM will already have been stripped.
+        encoding = "utf-8"
+    yield TokenInfo(tk.ENCODING, encoding, (0, 0), (0, 0), "")
+
+    rl_gen = itertools.chain(consumed, iter(readline, b""), itertools.repeat(b""))
+    lines = _Lines(rl_gen.__next__, encoding)
+
+    last_type = last_end = None
+    for type, string, start, end in _raw_tokens(lines):
+        srow, scol = start
+        erow = end[0]
+        if srow == erow:
+            line = lines[srow]
+        else:
+            line = lines.join(srow, erow)
+            # The C tokenizer may report a wrong end column for tokens spanning
+            # several lines, so recompute it from the string
+            end = (erow, len(string) - string.rindex("\n") - 1)
+
+        if type == tk.NEWLINE and not string:
+            # Implicit NEWLINE at the end of file
+            line = ""
+            end = (srow, scol + 1)
+
+        if last_end is not None:
+            row, col = last_end
+            if last_type == tk.NEWLINE or last_type == tk.NL:
+                row, col = row + 1, 0
+
+            # Rows skipped by the C tokenizer are joined with backslashes,
+            # which the vendored tokenizer reports as WHITESPACE tokens
+            while row < srow:
+                physical = lines[row]
+                cont = physical.rindex("\\")
+                if cont != col:
+                    yield TokenInfo(
+                        tk.WHITESPACE,
+                        _slice_whitespace(physical, col, cont),
+                        (row, col),
+                        (row, cont),
+                        physical,
+                    )
+                yield TokenInfo(
+                    tk.WHITESPACE,
+                    physical[cont:],
+                    (row, cont),
+                    (row, len(physical)),
+                    physical,
+                )
+                row, col = row + 1, 0
+
+            if col != scol:
+                yield TokenInfo(
+                    tk.WHITESPACE,
+                    _slice_whitespace(line, col, scol),
+                    (row, col),
+                    start,
+                    line,
+                )
+
+        yield TokenInfo(type, string, start, end, line)
+
+        last_type = type
+        last_end = end
+        lines.release(erow)
@@ -1,9 +1,20 @@
+import re
 from itertools import product
-from lambdex.fmt.core.definitions import tk, TokenInfo
+from collections import namedtuple
+from lambdex.fmt.core.definitions import tk, TokenInfo, State
 
 # A sentinel indicating an empty argument for `_make_key()`
 _empty = object()
 
+# A sentinel standing for any string that no rule is specific to
+_any_string = object()
+
+# A fake token for probing the rules when compiling the dispatch table
+_Probe = namedtuple("_Probe", ["exact_type", "string"])
+
+# Bytes that may form an identifier, including the UTF-8 encoded non-ASCII ones
+_IDENT_BYTES = rb"0-9A-Za-z_\x80-\xff"
+
 
 def _make_key(exact_type, string, last_state, *, strict=True):
     if exact_type == tk.NAME:
@@ -46,16 +57,53 @@ class Matcher:
     def __init__(self):
         self._mapping = {}
         self._keyword_to_symbol = {}
+        self._declarer_re = None
+        self._table = None
+        self._aliases = None
 
     def reset_aliases(self, *userpaths):
-        from lambdex._aliases import _Aliases, get_aliases
+        from lambdex._aliases import get_aliases
+
+        self.set_aliases(get_aliases(userpaths, reinit=True))
+
+    def set_aliases(self, aliases):
+        """
+        Match keywords with `aliases`.  The compiled table is kept if `aliases`
+        are the same as the current ones.
+        """
+        from lambdex._aliases import _Aliases
 
-        aliases = get_aliases(userpaths, reinit=True)
+        if aliases == self._aliases:
+            return
+        self._aliases = aliases
 
         self._keyword_to_symbol = {}
         for name, value in aliases._asdict().items():
             self._keyword_to_symbol[value] = getattr(_Aliases, name)
 
+        declarers = sorted({aliases.def_, aliases.async_def_})
+        self._declarer_re = re.compile(
+            b"(?<![%s])(?:%s)(?![%s])"
+            % (
+                _IDENT_BYTES,
+                b"|".join(re.escape(x.encode("utf-8")) for x in declarers),
+                _IDENT_BYTES,
+            )
+        )
+
+        self._table = self._compile()
+
+    def may_contain_declarer(self, source: bytes) -> bool:
+        """
+        Check whether `source` contains any word that is a declarer keyword.
+
+        This is a cheap pre-scan: a positive result does not imply that a
+        lambdex is actually declared in `source`.
+        """
+        if self._declarer_re is None:
+            return False
+        return self._declarer_re.search(source) is not None
+
     def __call__(self, *, exact_type=_empty, string=_empty, last_state=_empty):
         def _key_combinations():
             iters = []
@@ -69,18 +117,84 @@ class Matcher:
             for key in _key_combinations():
                 assert key not in self._mapping
                 self._mapping[key] = f
+            self._table = None
             return f
 
         return _inner
 
-    def dispatch(self, ctx, token):
-        for query in _generate_queries(token, ctx.last_state, self._keyword_to_symbol):
+    def _lookup(self, token, last_state):
+        """
+        Return the rule for `token` at `last_state`, or None if no rule matched.
+        """
+        for query in _generate_queries(token, last_state, self._keyword_to_symbol):
             if query in self._mapping:
-                return self._mapping[query](ctx, token)
+                return self._mapping[query]
+
+        return None
+
+    def _compile(self):
+        """
+        Build a table such that `table[last_state][exact_type]` is the rule to
+        apply.
+
+        The outcome depends on the token string only for keywords and strings
+        that some rule is registered with.  For an exact type with such
+        strings, the entry is instead a dict mapping them to their rules,
+        with the rule for any other string stored under `_any_string`.
+        """
+        strings_by_type = {}
+        strings = set(self._keyword_to_symbol)
+        strings.update(
+            key[1] for key in self._mapping if len(key) == 3 and type(key[1]) is str
+        )
+        for string in strings:
+            if string.isidentifier():
+                exact_type = tk.NAME
+            else:
+                exact_type = tk.EXACT_TOKEN_TYPES.get(string)
+            strings_by_type.setdefault(exact_type, []).append(string)
+
+        table = {}
+        for last_state in State:
+            row = table[last_state] = {}
+            for exact_type in tk.tok_name:
+                rule = self._lookup(_Probe(exact_type, _any_string), last_state)
+                subtable = {}
+                for string in strings_by_type.get(exact_type, ()):
+                    specific = self._lookup(_Probe(exact_type, string), last_state)
+                    if specific is not rule:
+                        subtable[string] = specific
+
+                if subtable:
+                    subtable[_any_string] = rule
+                    row[exact_type] = subtable
+                else:
+                    row[exact_type] = rule
+
+        return table
+
+    def _resolve(self, token, last_state):
+        """
+        Same as `_lookup()`, but through the compiled table.
+        """
+        table = self._table
+        if table is None:
+            table = self._table = self._compile()
+
+        rule = table[last_state].get(token.exact_type, _empty)
+        if rule.__class__ is dict:
+            return rule.get(token.string, rule[_any_string])
+        elif rule is _empty:
+            return self._lookup(token, last_state)
+        return rule
 
-        else:
-            # If all queries fail, pass through
+    def dispatch(self, ctx, token):
+        rule = self._resolve(token, ctx.last_state)
+        if rule is None:
+            # If no rule matched, pass through
             return None
 
+        return rule(ctx, token)
+
 
 matcher = Matcher()
@@ -10,7 +10,7 @@ from .matcher import matcher as m
 @m(exact_type=tk.NEWLINE, last_state=State.EXPECT_LBDX_NAME)
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
-    return actions.StopBuffer()
+    return actions.stop_buffer
 
 
 @m(exact_type=tk.COMMENT, last_state=State.DISABLED)
@@ -64,7 +64,7 @@ def r(ctx: Context, token: TokenInfo):
     ctx.push_state(State.EXPECT_LBDX_LPAR)
 
     ctx.cache = token
-    return actions.StartBuffer()
+    return actions.start_buffer
 
 
 @m(exact_type=tk.DOT, last_state=State.EXPECT_LBDX_LPAR)
@@ -88,7 +88,7 @@ def r(ctx: Context, token: TokenInfo):
     ctx.push_state(State.IN_LBDX_CALL)
     token.annotation = A.DECL_LPAR
     ctx.push_op(token)
-    return actions.StopBuffer()
+    return actions.stop_buffer
 
 
 @m(last_state=State.MUST_LBDX_LPAR)
@@ -96,7 +96,7 @@ def r(ctx: Context, token: TokenInfo):
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
     ctx.cache = None
-    return actions.StopBuffer(dont_consume=True)
+    return actions.stop_buffer_and_dont_consume
 
 
 @m(exact_type=tk.NAME, string="lambda", last_state=State.IN_LBDX_CALL)
@@ -125,7 +125,7 @@ def r(ctx: Context, token: TokenInfo):
     sentinel = TokenInfo.new_sentinel_after(token, A.STMT_START)
     ctx.push_ret(sentinel)
 
-    return actions.Default(dont_store=True)
+    return actions.dont_store
 
 
 @m(exact_type=tk.COMMA, last_state=State.IN_LBDX_BODY_LIST)
@@ -142,7 +142,7 @@ def r(ctx: Context, token: TokenInfo):
     sentinel = TokenInfo.new_sentinel_after(token, A.STMT_START)
     ctx.push_ret(sentinel)
 
-    return actions.Default(dont_store=True)
+    return actions.dont_store
 
 
 @m(exact_type=tk.RSQB, last_state=State.IN_LBDX_BODY_LIST)
@@ -155,7 +155,7 @@ def r(ctx: Context, token: TokenInfo):
         ctx.push_ret(sentinel)
         token.annotation = A.BODY_RSQB
         ctx.push_ret(token)
-        return actions.Default(dont_store=True)
+        return actions.dont_store
 
 
 @m(exact_type=tk.RPAR, last_state=State.EXPECT_LBDX_RPAR)
@@ -195,7 +195,7 @@ def r(ctx: Context, token: TokenInfo):
 def r(ctx: Context, token: TokenInfo):
     ctx.push_state(State.EXPECT_CLS_HEAD_LSQB)
     ctx.cache = [token]
-    return actions.StartBuffer()
+    return actions.start_buffer
 
 
 @m(exact_type=tk.LSQB, last_state=State.EXPECT_CLS_HEAD_LSQB)
@@ -208,7 +208,7 @@ def r(ctx: Context, token: TokenInfo):
     _annotate_clause_declarer(ctx)
     ctx.cache = None
     if ctx.is_buffering():
-        return actions.StopBuffer()
+        return actions.stop_buffer
 
 
 @m(last_state=State.EXPECT_CLS_HEAD_LSQB)
@@ -216,7 +216,7 @@ def r(ctx: Context, token: TokenInfo):
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
     ctx.cache = None
-    return actions.StopBuffer()
+    return actions.stop_buffer
 
 
 @m(exact_type=tk.RSQB, last_state=State.IN_LBDX_CLS_HEAD)
@@ -232,12 +232,12 @@ def r(ctx: Context, token: TokenInfo):
 def r(ctx: Context, token: TokenInfo):
     ctx.push_state(State.EXPECT_CLS_BODY_LSQB)
     ctx.cache = [token]
-    return actions.StartBuffer()
+    return actions.start_buffer
 
 
 def _annotate_clause_declarer(ctx: Context):
     if ctx.cache is None:
-        return actions.Default()
+        return actions.default
     if not isinstance(ctx.cache, list):
         ctx.error()
     length = len(ctx.cache)
@@ -253,7 +253,7 @@ def _annotate_clause_declarer(ctx: Context):
 @m(exact_type=tk.LSQB, last_state=State.EXPECT_CLS_BODY_LSQB)
 def r(ctx: Context, token: TokenInfo):
     if ctx.is_buffering():
-        return actions.StopBuffer(dont_consume=True)
+        return actions.stop_buffer_and_dont_consume
 
     ctx.pop_state()
     ctx.push_state(State.IN_LBDX_CLS_BODY)
@@ -267,7 +267,7 @@ def r(ctx: Context, token: TokenInfo):
     sentinel = TokenInfo.new_sentinel_after(token, A.STMT_START)
     ctx.push_ret(sentinel)
 
-    return actions.Default(dont_store=True)
+    return actions.dont_store
 
 
 @m(exact_type=tk.COMMA, last_state=State.IN_LBDX_CLS_BODY)
@@ -281,7 +281,7 @@ def r(ctx: Context, token: TokenInfo):
     sentinel = TokenInfo.new_sentinel_after(token, A.STMT_START)
     ctx.push_ret(sentinel)
 
-    return actions.Default(dont_store=True)
+    return actions.dont_store
 
 
 @m(exact_type=tk.RSQB, last_state=State.IN_LBDX_CLS_BODY)
@@ -294,25 +294,16 @@ def r(ctx: Context, token: TokenInfo):
         ctx.push_ret(sentinel)
         token.annotation = A.CLS_BODY_RSQB
         ctx.push_ret(token)
-        return actions.Default(dont_store=True)
+        return actions.dont_store
 
 
 @m(exact_type=tk.DOT, last_state=State.EXPECT_SUBCLS_DOT)
-@m(exact_type=tk.DOT, last_state=State.MUST_SUBCLS_DOT_WITH_HEAD)
-@m(exact_type=tk.DOT, last_state=State.MUST_SUBCLS_DOT_WITH_BODY)
 def r(ctx: Context, token: TokenInfo):
-    last_state = ctx.pop_state()
-
-    new_state = {
-        State.EXPECT_SUBCLS_DOT: State.EXPECT_SUBCLS_NAME,
-        State.MUST_SUBCLS_DOT_WITH_HEAD: State.MUST_SUBCLS_NAME_WITH_HEAD,
-        State.MUST_SUBCLS_DOT_WITH_BODY: State.MUST_SUBCLS_NAME_WITH_BODY,
-    }[last_state]
-
-    ctx.push_state(new_state)
+    ctx.pop_state()
+    ctx.push_state(State.EXPECT_SUBCLS_NAME)
     ctx.cache = [token]
 
-    return actions.StartBuffer()
+    return actions.start_buffer
 
 
 @m(exact_type=tk.COMMA, last_state=State.EXPECT_SUBCLS_DOT)
@@ -328,17 +319,17 @@ def r(ctx: Context, token: TokenInfo):
     ctx.push_ret(sentinel)
 
     if ctx.is_buffering():
-        return actions.StopBuffer(dont_store=True)
+        return actions.stop_buffer_and_dont_store
 
-    return actions.Default(dont_store=True)
+    return actions.dont_store
 
 
 @m(last_state=State.EXPECT_SUBCLS_DOT)
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
     if ctx.is_buffering():
-        return actions.StopBuffer(dont_consume=True)
-    return actions.Default(dont_consume=True)
+        return actions.stop_buffer_and_dont_consume
+    return actions.dont_consume
 
 
 @m(exact_type=tk.NAME, string=_Aliases.else_, last_state=State.EXPECT_SUBCLS_NAME)
@@ -357,57 +348,28 @@ def r(ctx: Context, token: TokenInfo):
 
 
 @m(exact_type=tk.NAME, string=_Aliases.except_, last_state=State.EXPECT_SUBCLS_NAME)
-@m(
-    exact_type=tk.NAME,
-    string=_Aliases.except_,
-    last_state=State.MUST_SUBCLS_NAME_WITH_HEAD,
-)
-@m(
-    exact_type=tk.NAME,
-    string=_Aliases.except_,
-    last_state=State.MUST_SUBCLS_NAME_WITH_BODY,
-)
 def r(ctx: Context, token: TokenInfo):
-    last_state = ctx.pop_state()
+    ctx.pop_state()
     ctx.cache.append(token)
-
-    new_state = {
-        State.EXPECT_SUBCLS_NAME: State.EXPECT_CLS_HEAD_OR_BODY_LSQB,
-        State.MUST_SUBCLS_NAME_WITH_HEAD: State.EXPECT_CLS_HEAD_LSQB,
-        State.MUST_SUBCLS_NAME_WITH_BODY: State.EXPECT_CLS_BODY_LSQB,
-    }[last_state]
-
-    ctx.push_state(new_state)
+    ctx.push_state(State.EXPECT_CLS_HEAD_OR_BODY_LSQB)
 
 
 @m(exact_type=tk.LSQB, last_state=State.EXPECT_CLS_HEAD_OR_BODY_LSQB)
 def r(ctx: Context, token: TokenInfo):
-    ctx.push_op(token)
+    # `except_[...]` is a head if another `[` follows, otherwise a body
     ctx.pop_state()
-    ctx.push_state(State.EXPECT_CLS_HEAD_OR_BODY_RSQB)
+    if ctx.tokenseq.is_followed_by_lsqb(token):
+        ctx.push_state(State.EXPECT_CLS_HEAD_LSQB)
+    else:
+        ctx.push_state(State.EXPECT_CLS_BODY_LSQB)
+
+    return m.dispatch(ctx, token)
 
 
 @m(last_state=State.EXPECT_CLS_HEAD_OR_BODY_LSQB)
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
-    return actions.StopBuffer()
-
-
-@m(exact_type=tk.RSQB, last_state=State.EXPECT_CLS_HEAD_OR_BODY_RSQB)
-def r(ctx: Context, token: TokenInfo):
-    if ctx.pop_op()[1] == State.EXPECT_CLS_HEAD_OR_BODY_LSQB:
-        ctx.pop_state()
-        ctx.push_state(State.EXPECT_CLS_MAYBE_BODY_LSQB)
-
-
-@m(exact_type=tk.LSQB, last_state=State.EXPECT_CLS_MAYBE_BODY_LSQB)
-def r(ctx: Context, token: TokenInfo):
-    return actions.Backtrace().state(State.MUST_SUBCLS_DOT_WITH_HEAD)
-
-
-@m(last_state=State.EXPECT_CLS_MAYBE_BODY_LSQB)
-def r(ctx: Context, token: TokenInfo):
-    return actions.Backtrace().state(State.MUST_SUBCLS_DOT_WITH_BODY)
+    return actions.stop_buffer
 
 
 @m(
@@ -434,7 +396,7 @@ def r(ctx: Context, token: TokenInfo):
 
     ctx.cache = [token]
     ctx.push_state(State.EXPECT_AUGASSIGN_DASH)
-    return actions.StartBuffer()
+    return actions.start_buffer
 
 
 @m(exact_type=tk.NAME, string="_", last_state=State.EXPECT_AUGASSIGN_DASH)
@@ -447,7 +409,7 @@ def r(ctx: Context, token: TokenInfo):
 @m(last_state=State.EXPECT_AUGASSIGN_DASH)
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
-    return actions.StopBuffer(dont_consume=True)
+    return actions.stop_buffer_and_dont_consume
 
 
 @m(exact_type=_Aliases.Assignment, last_state=State.EXPECT_AUGASSIGN_ASSIGN)
@@ -455,10 +417,10 @@ def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
     ctx.cache[0].annotation = A.AUGASSIGN_START
     token.annotation = A.AUGASSIGN_END
-    return actions.StopBuffer()
+    return actions.stop_buffer
 
 
 @m(last_state=State.EXPECT_AUGASSIGN_ASSIGN)
 def r(ctx: Context, token: TokenInfo):
     ctx.pop_state()
-    return actions.StopBuffer(dont_consume=True)
+    return actions.stop_buffer_and_dont_consume
@@ -3,10 +3,11 @@ from typing import List
 from lambdex.fmt.core._stream_base import _StreamWithLog
 from lambdex.fmt.core.definitions import TokenInfo, tk, Context, A, actions, BTStream
 
+from . import ctokenize
+from ._common import _slice_whitespace
 from .rules import matcher
 from .builtins import tokenize as bltokenize
 
-
 class AddWhitespace(_StreamWithLog):
     def _handle_token(self, token: TokenInfo):
         ws_start = ws_end = None
@@ -26,7 +27,7 @@ class AddWhitespace(_StreamWithLog):
         if ws_start is not None:
             whitespace_token = TokenInfo(
                 tk.WHITESPACE,
-                token.line[ws_start[1] : ws_end[1]],
+                _slice_whitespace(token.line, ws_start[1], ws_end[1]),
                 ws_start,
                 ws_end,
                 token.line,
@@ -36,7 +37,7 @@ class AddWhitespace(_StreamWithLog):
         self.last_token = token
         yield token
 
-        self.action = actions.Default(dont_store=True)
+        self.action = actions.dont_store
 
 
 class RearrangeSentinel(_StreamWithLog):
@@ -46,7 +47,7 @@ class RearrangeSentinel(_StreamWithLog):
     def _handle_token(self, token: TokenInfo):
         if token.is_WS_NL_CMT or token == A.STMT_START:
             if not self.buffering:
-                self.action = actions.StartBuffer()
+                self.action = actions.start_buffer
         elif self.buffering:
             if self.stmt_start_in_buffer is not None:
                 yield from self.buffer
@@ -62,7 +63,7 @@ class RearrangeSentinel(_StreamWithLog):
                 yield from self.buffer
                 yield token
             self.stmt_start_in_buffer = None
-            self.action = actions.StopBuffer(dont_yield_buffer=True, dont_store=True)
+            self.action = actions.stop_buffer_and_dont_yield_buffer_or_store
 
     def _append_buffer(self, token):
         if token == A.STMT_START:
@@ -82,7 +83,7 @@ class HandleLastSTMT(_StreamWithLog):
 
     def _handle_token(self, token: TokenInfo):
         if token.annotation == A.STMT_END and not self.buffering:
-            self.action = actions.StartBuffer()
+            self.action = actions.start_buffer
         elif self.buffering and token.annotation in (
             A.BODY_RSQB,
             A.CLS_BODY_RSQB,
@@ -104,10 +105,10 @@ class HandleLastSTMT(_StreamWithLog):
                 yield from self.buffer
 
             self.insert_last_stmt_at = None
-            self.action = actions.StopBuffer(dont_yield_buffer=True)
+            self.action = actions.stop_buffer_and_dont_yield_buffer
         elif self.buffering and token == A.STMT_START:
             self.insert_last_stmt_at = None
-            self.action = actions.StopBuffer()
+            self.action = actions.stop_buffer
 
 
 class Annotate(_StreamWithLog):
@@ -152,18 +153,13 @@ class Annotate(_StreamWithLog):
             yield from self.context.ret
             self.context.ret.clear()
 
-    def _handle_unknown_action(self, token, action):
-
-        assert actions.Backtrace.is_class_of(action)
-        if action.new_state is not None:
-            self.context.state_stack[-1] = action.new_state
-        self.tokenseq.backtrace()
-        return ()
-
 
-def tokenize(readline):
-    seq = bltokenize.tokenize(readline)
-    seq = AddWhitespace(seq)
+def tokenize(readline, use_ctokenize: bool = ctokenize.AVAILABLE):
+    if use_ctokenize:
+        seq = ctokenize.tokenize(readline)
+    else:
+        seq = bltokenize.tokenize(readline)
+        seq = AddWhitespace(seq)
     seq = BTStream(seq)
     seq = Annotate(seq)
     seq = RearrangeSentinel(seq)
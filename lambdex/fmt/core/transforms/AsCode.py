@@ -2,16 +2,28 @@ from typing import Sequence, Union
 
 from lambdex.fmt.core.definitions import TokenInfo, tk
 
+# Number of token strings joined at a time
+_CHUNK_SIZE = 1024
+
 
 def AsCode(tokenseq: Sequence[TokenInfo], *, encode=False) -> Union[str, bytes]:
     encoding = ""
+    # Token strings are joined into chunks as tokens arrive, so that memory
+    # kept until the end of the stream is proportional to the output size,
+    # rather than to the number of tokens
+    chunks = []
     token_strings = []
     for token in tokenseq:
         if token.type == tk.ENCODING:
             encoding = token.string
-        else:
-            token_strings.append(token.string)
-    result = "".join(token_strings)
+            continue
+
+        token_strings.append(token.string)
+        if len(token_strings) == _CHUNK_SIZE:
+            chunks.append("".join(token_strings))
+            token_strings.clear()
+    chunks.append("".join(token_strings))
+    result = "".join(chunks)
     if encode:
         result = result.encode(encoding)
     return result
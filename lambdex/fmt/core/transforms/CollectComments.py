@@ -97,7 +97,7 @@ class CollectComments(_StreamWithLog):
 
         if not self.buffering:
             if token.annotation in START_TOKENS:
-                self.action = actions.StartBuffer()
+                self.action = actions.start_buffer
                 self.pattern = [token.annotation]
             return
 
@@ -115,7 +115,7 @@ class CollectComments(_StreamWithLog):
                 yield token
                 yield from comments
 
-            self.action = actions.StopBuffer(dont_yield_buffer=True, dont_store=True)
+            self.action = actions.stop_buffer_and_dont_yield_buffer_or_store
             return
         elif matched:
             return
@@ -129,9 +129,9 @@ class CollectComments(_StreamWithLog):
             yield from others
             yield token
 
-            self.action = actions.StopBuffer(dont_yield_buffer=True, dont_store=True)
+            self.action = actions.stop_buffer_and_dont_yield_buffer_or_store
             return
         elif matched:
             return
 
-        self.action = actions.StopBuffer(dont_consume=True)
+        self.action = actions.stop_buffer_and_dont_consume
@@ -13,5 +13,5 @@ ANNOTATIONS_TO_DROP = frozenset(
 class DropToken(_StreamWithLog):
     def _handle_token(self, token: TokenInfo):
         if token.annotation in ANNOTATIONS_TO_DROP:
-            self.action = actions.Default(dont_store=True)
+            self.action = actions.dont_store
         return ()
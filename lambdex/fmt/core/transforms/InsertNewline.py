@@ -49,9 +49,9 @@ class InsertNewline(_StreamWithLog):
 
         if token.annotation in START_TOKENS:
             if self.buffering:
-                self.action = actions.StopBuffer(dont_consume=True)
+                self.action = actions.stop_buffer_and_dont_consume
                 return ()
-            self.action = actions.StartBuffer()
+            self.action = actions.start_buffer
             return ()
 
         if (self.last_token.annotation, token.annotation) in INSERT_BETWEEN:
@@ -59,7 +59,7 @@ class InsertNewline(_StreamWithLog):
             self._annotate_NL_before_RSQB(token)
 
             self._reset()
-            self.action = actions.StopBuffer()
+            self.action = actions.stop_buffer
             return ()
 
         self._reset()
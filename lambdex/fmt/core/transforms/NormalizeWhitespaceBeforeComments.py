@@ -29,14 +29,14 @@ class NormalizeWhitespaceBeforeComments(_StreamWithLog):
                 self.leading = True
 
             if not self.buffering:
-                self.action = actions.StartBuffer()
+                self.action = actions.start_buffer
             self.newlined = False
 
             return
 
         if not token.is_CMT:
             if self.buffering:
-                self.action = actions.StopBuffer()
+                self.action = actions.stop_buffer
             self.leading = False
             self.newlined = False
 
@@ -45,18 +45,16 @@ class NormalizeWhitespaceBeforeComments(_StreamWithLog):
         if not self.buffering and not self.newlined:
             yield TokenInfo(tk.WHITESPACE, "  ")
             yield token
-            self.action = actions.Default(dont_store=True)
+            self.action = actions.dont_store
             return
 
         if self.buffering:
             if any("\\" in x.string for x in self.buffer) or self.leading:
-                self.action = actions.StopBuffer()
+                self.action = actions.stop_buffer
             else:
                 yield TokenInfo(tk.WHITESPACE, "  ")
                 yield token
-                self.action = actions.StopBuffer(
-                    dont_store=True, dont_yield_buffer=True
-                )
+                self.action = actions.stop_buffer_and_dont_yield_buffer_or_store
 
             self.leading = False
             self.newlined = False
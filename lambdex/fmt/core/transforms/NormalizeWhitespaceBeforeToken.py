@@ -27,7 +27,7 @@ class NormalizeWhitespaceBeforeToken(_StreamWithLog):
 
         if token.is_WS_NL:
             if not self.buffering:
-                self.action = actions.StartBuffer()
+                self.action = actions.start_buffer
             return
 
         if token.annotation in NORMALIZE_WHITESPACE_BEFORE:
@@ -44,8 +44,8 @@ class NormalizeWhitespaceBeforeToken(_StreamWithLog):
             yield whitespace
 
             if self.buffering:
-                self.action = actions.StopBuffer(dont_yield_buffer=True)
+                self.action = actions.stop_buffer_and_dont_yield_buffer
         elif self.buffering:
-            self.action = actions.StopBuffer()
+            self.action = actions.stop_buffer
 
         self.prev_non_ws_token = token
\ No newline at end of file
@@ -106,4 +106,4 @@ class Reindent(_StreamWithLog):
             self.newlined = True
 
         yield token
-        self.action = actions.Default(dont_store=True)
+        self.action = actions.dont_store
@@ -18,5 +18,5 @@ SUPPRESS_WHITESPACE_AFTER = frozenset(
 class SuppressWhitespaces(_StreamWithLog):
     def _handle_token(self, token):
         if self.last_token.annotation in SUPPRESS_WHITESPACE_AFTER and token.is_WS_NL:
-            self.action = actions.Default(dont_store=True)
+            self.action = actions.dont_store
         return ()
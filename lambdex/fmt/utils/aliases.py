@@ -0,0 +1,52 @@
+import os
+from typing import Optional
+
+from lambdex._config import _stamp, get_config_path
+from lambdex._aliases import _Aliases, get_aliases
+
+
+class AliasesCache:
+    """
+    Aliases for the files being formatted, memoized per directory.
+
+    Resolving the aliases for a file walks up its parents for a config file,
+    the result of which is shared by all files in the same directory.  An
+    entry is dropped once the config file found is modified.
+
+    The working directory and environment variables are assumed to stay the
+    same during the lifetime of a cache.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, filename: Optional[str] = None) -> _Aliases:
+        if filename is None:
+            directory = None
+        else:
+            directory = os.path.dirname(os.path.abspath(filename))
+
+        entry = self._entries.get(directory)
+        if entry is not None:
+            config_path, stamp, aliases = entry
+            if config_path is None or _try_stamp(config_path) == stamp:
+                return aliases
+
+        userpaths = () if filename is None else (filename,)
+        aliases = get_aliases(userpaths, reinit=True)
+
+        # The config file is only searched for if aliases are enabled
+        config_path = None
+        if os.getenv("LXALIAS") is not None:
+            config_path = get_config_path()
+
+        stamp = None if config_path is None else _try_stamp(config_path)
+        self._entries[directory] = config_path, stamp, aliases
+        return aliases
+
+
+def _try_stamp(path):
+    try:
+        return _stamp(path)
+    except OSError:
+        return None
@@ -1,7 +1,11 @@
+import os
+import re
 import abc
 import sys
 import difflib
 import pathlib
+import tempfile
+import tokenize
 from io import BytesIO
 
 from lambdex.fmt.jobs_meta import JobsMeta
@@ -25,11 +29,57 @@ def get_stdin() -> bytes:
     return b"".join(contents)
 
 
+def detect_newline(source: bytes) -> str:
+    """
+    Return the newline sequence used by the first line of `source`.  Fall back
+    to LF if `source` contains no line break.
+    """
+    idx = source.find(b"\n")
+    if idx > 0 and source[idx - 1 : idx] == b"\r":
+        return "\r\n"
+    return "\n"
+
+
+_BARE_LF_RE = re.compile(r"(?<!\r)\n")
+
+
+def atomic_write_bytes(path: pathlib.Path, data: bytes):
+    """
+    Write `data` to `path` atomically.
+
+    The content is written to a temporary file in the same directory, which
+    then replaces `path` via `os.replace()`.  Permission bits of the original
+    file are preserved, and symlinks are written through.
+    """
+    path = pathlib.Path(path).resolve()
+    fd, tmp_name = tempfile.mkstemp(
+        prefix="." + path.name + ".", suffix=".lxfmt", dir=str(path.parent)
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        try:
+            os.chmod(tmp_name, path.stat().st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp_name, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 class _ResourceBase(abc.ABC):
     def __init__(self, jobs_meta: JobsMeta):
         self._meta = jobs_meta
         self._source = self._get_source()
         self._backend_output_stream = None
+        self._encoding = None
+        self._newline = None
 
     @abc.abstractmethod
     def _get_source(self) -> bytes:
@@ -51,13 +101,47 @@ class _ResourceBase(abc.ABC):
         assert self._backend_output_stream is not None
         return self._backend_output_stream
 
+    @property
+    def encoding(self) -> str:
+        """
+        Encoding of the source, detected as the Python tokenizer does.
+        """
+        if self._encoding is None:
+            try:
+                self._encoding, _ = tokenize.detect_encoding(
+                    BytesIO(self._source).readline
+                )
+            except SyntaxError:
+                self._encoding = "utf-8"
+        return self._encoding
+
+    @property
+    def newline(self) -> str:
+        """
+        Newline style of the source.
+        """
+        if self._newline is None:
+            self._newline = detect_newline(self._source)
+        return self._newline
+
+    def encode(self, formatted_code: str) -> bytes:
+        """
+        Encode `formatted_code` with the encoding and newline style of the source.
+
+        The formatter may insert bare LFs, which are converted so that the
+        output does not mix newline styles.
+        """
+        if self.newline != "\n":
+            formatted_code = _BARE_LF_RE.sub(self.newline, formatted_code)
+        return formatted_code.encode(self.encoding)
+
     def is_changed(self, formatted_code: str) -> bool:
-        return self._source.decode("utf-8") != formatted_code
+        return self.encode(formatted_code) != self._source
 
     def write_formatted_code(self, formatted_code: str):
         content = formatted_code
         if self._meta.print_diff:
-            before = self._source.decode("utf-8").splitlines()
+            before = self._source.decode(self.encoding).splitlines()
             after = formatted_code.splitlines()
             content = (
                 "\n".join(
@@ -121,6 +205,9 @@ class FileResource(_ResourceBase):
 
     def _write_content(self, content: str):
         if self._meta.in_place:
-            self._filepath.write_text(content)
+            data = self.encode(content)
+            # Leave unchanged files untouched, so that their mtimes are kept
+            if data != self._source:
+                atomic_write_bytes(self._filepath, data)
         elif not self._meta.quiet:
             sys.stdout.write(content)
@@ -79,17 +79,36 @@ class _Logger(logging.Logger):
         sys.exit(2)
 
 
+class _StdStreamHandler(logging.StreamHandler):
+    """
+    A handler writing to `sys.<name>` as it is when a record is emitted, so
+    that the logs follow the standard streams when they are replaced.
+    """
+
+    def __init__(self, name: str):
+        self._stream_name = name
+        super(_StdStreamHandler, self).__init__()
+
+    @property
+    def stream(self):
+        return getattr(sys, self._stream_name)
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
 def getLogger(name: str) -> _Logger:
     logger = _Logger(name)
 
     formatter = _Formatter()
 
-    handler = logging.StreamHandler(sys.stderr)
+    handler = _StdStreamHandler("stderr")
     handler.setFormatter(formatter)
     handler.setLevel(logging.WARNING)
     logger.addHandler(handler)
 
-    handler = logging.StreamHandler(sys.stdout)
+    handler = _StdStreamHandler("stdout")
     handler.setFormatter(formatter)
     handler.setLevel(logging.DEBUG if IS_DEBUG else logging.INFO)
     logger.addHandler(handler)
@@ -1,9 +1,48 @@
-from . import ast_parser, compiler, _aliases
+from . import _aliases
 
 aliases = _aliases.get_aliases()
 
 __all__ = [aliases.def_, aliases.async_def_]
 
+# The identifier reserved for declarations compiled in the background, i.e.,
+# `<keyword>.lazy(<lambda>)`
+LAZY_IDENTIFIER = "lazy"
+
+
+def _compile_lambdex(declarer):
+    """
+    Import the compiler on the first declaration, and rebind this name to the
+    real `compile_lambdex()` so that later calls go to it directly.
+    """
+    global _compile_lambdex
+    from .compiler import compile_lambdex
+
+    _compile_lambdex = compile_lambdex
+    return compile_lambdex(declarer)
+
+
+def _compile_lazily(declarer):
+    """
+    Same as `_compile_lambdex()`, but for `lambdex.compiler.lazy.compile_lazily()`.
+    """
+    global _compile_lazily
+    from .compiler.lazy import compile_lazily
+
+    _compile_lazily = compile_lazily
+    return compile_lazily(declarer)
+
+
+def make_key(keyword: str, identifier, code_obj=None) -> tuple:
+    """
+    Construct a unique key for a declaration `<keyword>.<identifier>(...)` whose
+    lambda has code object `code_obj`.
+    """
+    extra = ()
+    if code_obj is not None:
+        extra = (code_obj.co_filename, code_obj.co_firstlineno, code_obj.co_code)
+
+    return (keyword, identifier, *extra)
+
 
 class Declarer:
     """
@@ -44,6 +83,8 @@ class Declarer:
         This process requires `self.__keyword` and `self.__identifier` and thus can not be
         performed outside.
         """
+        from . import ast_parser
+
         return ast_parser.lambda_to_ast(
             self.func, keyword=self.__keyword, identifier=self.__identifier
         )
@@ -51,20 +92,21 @@ class Declarer:
     def __call__(self, f):
         """
         Transpile `f` into ordinary function and returns it.
+
+        If `self.__identifier` is `LAZY_IDENTIFIER`, `f` is transpiled in the
+        background and a `LazyLambdex` is returned instead.
         """
         self.func = f
-        return compiler.compile_lambdex(self)
+        if self.__identifier == LAZY_IDENTIFIER:
+            return _compile_lazily(self)
+        return _compile_lambdex(self)
 
     def get_key(self):
         """
         Construct a unique key for `self.func`.
         """
-        extra = ()
-        if self.func is not None:
-            code_obj = self.func.__code__
-            extra = (code_obj.co_filename, code_obj.co_firstlineno, code_obj.co_code)
-
-        return (self.__keyword, self.__identifier, *extra)
+        code_obj = self.func.__code__ if self.func is not None else None
+        return make_key(self.__keyword, self.__identifier, code_obj)
 
 
 globals()[aliases.def_] = Declarer(aliases.def_)
@@ -0,0 +1,239 @@
+"""
+Manifests of lambdex declarations, for deployments without source files.
+
+Lambdexes are compiled from their source, which is not available when a
+package is shipped as `.pyc` files only.  A manifest is a sidecar file of a
+module holding the AST of each lambdex declaration in it, so that the
+declarations can be resolved without reading the source.
+
+Manifests are placed like bytecode files:
+
+- `pkg/__pycache__/mod.<cache_tag>.lxm` for `pkg/mod.py`;
+- `pkg/mod.lxm` for a sourceless `pkg/mod.pyc`, written with `-b`.
+
+A manifest is ignored if it was built by another interpreter version, or if
+the source it was built from still exists and has been modified since.
+
+Usage: python -m lambdex.manifest [-b] [-q] PATH [PATH ...]
+"""
+
+from typing import Dict, List, Optional
+
+import os
+import sys
+import ast
+import types
+import pickle
+import importlib.util
+
+__all__ = ["get_manifest_path", "build_manifest", "find_declarations"]
+
+MANIFEST_SUFFIX = ".lxm"
+
+_MAGIC = "lambdex-manifest-1"
+
+# Mapping from module paths to loaded declarations, or None if no valid
+# manifest is found
+_loaded = {}
+
+
+def get_manifest_path(module_path: str, *, legacy: bool = False) -> Optional[str]:
+    """
+    Return the path of the manifest of the module at `module_path`, which may
+    be a source or bytecode file.  Return None if modules are not cached by
+    the current interpreter.
+
+    If `legacy` is True, the manifest is placed beside the source, which is
+    the place of sourceless bytecode files.
+    """
+    base, ext = os.path.splitext(module_path)
+    if ext == ".pyc" or legacy:
+        return base + MANIFEST_SUFFIX
+
+    try:
+        cache_path = importlib.util.cache_from_source(module_path)
+    except NotImplementedError:
+        return None
+    return os.path.splitext(cache_path)[0] + MANIFEST_SUFFIX
+
+
+def _stamp(path: str):
+    """
+    Return a value that changes whenever the file at `path` is modified.
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _dump_declaration(node: ast.Call) -> bytes:
+    """
+    Pickle the declaration `node`, with the same column offsets as it is
+    parsed from the source, where its first line starts at the keyword.
+    """
+    from .ast_parser import shift_to_keyword
+
+    node = shift_to_keyword(pickle.loads(pickle.dumps(node)))
+    return pickle.dumps(node, pickle.HIGHEST_PROTOCOL)
+
+
+def _collect_declarations(tree: ast.AST) -> Dict[tuple, List[bytes]]:
+    """
+    Pickle each lambdex declaration in `tree`, keyed by the line number of
+    its lambda, the keyword and the identifier.  The line number is the same
+    as `co_firstlineno` of the lambda.
+    """
+    from .ast_parser import _make_pattern, _shallow_match_ast
+
+    declarations = {}
+    iterator = _shallow_match_ast(
+        tree, _make_pattern(None, None), yield_node_only=False
+    )
+    for node, (keyword, identifier) in iterator:
+        key = (node.args[0].lineno, keyword, identifier)
+        declarations.setdefault(key, []).append(_dump_declaration(node))
+    return declarations
+
+
+def build_manifest(source_path: str, *, legacy: bool = False) -> Optional[str]:
+    """
+    Build the manifest of the source file at `source_path` with the aliases in
+    effect.  Return the path of the manifest, or None if the module contains
+    no lambdex declarations.
+    """
+    manifest_path = get_manifest_path(source_path, legacy=legacy)
+    if manifest_path is None:
+        return None
+
+    stamp = _stamp(source_path)
+    with open(source_path, "rb") as fd:
+        source = fd.read()
+    declarations = _collect_declarations(ast.parse(source, source_path))
+    if not declarations:
+        return None
+
+    manifest = {
+        "magic": _MAGIC,
+        "cache_tag": sys.implementation.cache_tag,
+        "stamp": stamp,
+        "declarations": declarations,
+    }
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as fd:
+            pickle.dump(manifest, fd, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, manifest_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return manifest_path
+
+
+def _load_declarations(module_path: str, source_path: str) -> Optional[dict]:
+    """
+    Load the declarations from the manifest of the module at `module_path`.
+    Return None if the manifest does not exist or is outdated.
+    """
+    manifest_path = get_manifest_path(module_path)
+    if manifest_path is None:
+        return None
+
+    try:
+        with open(manifest_path, "rb") as fd:
+            manifest = pickle.load(fd)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("magic") != _MAGIC
+        or manifest.get("cache_tag") != sys.implementation.cache_tag
+    ):
+        return None
+
+    # The source takes precedence over the manifest if it has been modified
+    try:
+        if _stamp(source_path) != tuple(manifest["stamp"]):
+            return None
+    except OSError:
+        pass
+
+    return manifest["declarations"]
+
+
+def find_declarations(
+    lambda_object: types.FunctionType, keyword: str, identifier: Optional[str]
+) -> Optional[List[ast.Call]]:
+    """
+    Return the AST nodes of declarations in the manifest that may define
+    `lambda_object`.  Return None if its module has no valid manifest.
+
+    The nodes are unpickled on each call, since the compiler modifies them.
+    """
+    module_path = lambda_object.__globals__.get("__file__")
+    if not isinstance(module_path, str):
+        return None
+
+    try:
+        declarations = _loaded[module_path]
+    except KeyError:
+        declarations = _loaded[module_path] = _load_declarations(
+            module_path, lambda_object.__code__.co_filename
+        )
+    if declarations is None:
+        return None
+
+    key = (lambda_object.__code__.co_firstlineno, keyword, identifier or None)
+    return [pickle.loads(data) for data in declarations.get(key, ())]
+
+
+def _iter_sources(paths: List[str]):
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m lambdex.manifest",
+        description="Build manifests of lambdex declarations for source files.",
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH")
+    parser.add_argument(
+        "-b",
+        dest="legacy",
+        action="store_true",
+        help="write manifests beside the sources, for sourceless deployments",
+    )
+    parser.add_argument("-q", dest="quiet", action="store_true")
+    opts = parser.parse_args(argv)
+
+    failed = False
+    for source_path in _iter_sources(opts.paths):
+        try:
+            manifest_path = build_manifest(source_path, legacy=opts.legacy)
+        except (OSError, SyntaxError, ValueError) as exc:
+            print("{}: {}".format(source_path, exc), file=sys.stderr)
+            failed = True
+            continue
+        if manifest_path is not None and not opts.quiet:
+            print("{} -> {}".format(source_path, manifest_path))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
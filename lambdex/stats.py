@@ -0,0 +1,170 @@
+"""
+Profile the lambdex declarations of a script, and list the ones taking the
+most time by line or by file.
+
+Usage:
+    python -m lambdex.stats [-n TOP] [-g {line,file}] SCRIPT [ARGS ...]
+    python -m lambdex.stats [-n TOP] [-g {line,file}] -m MODULE [ARGS ...]
+"""
+
+from typing import List, Optional
+
+import os
+import sys
+
+from .compiler import profiler
+
+__all__ = ["Stats"]
+
+
+class _Site:
+    """
+    Accumulated timings of the declarations at a location.
+    """
+
+    __slots__ = ["calls", "hits", "total", "timings"]
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.total = 0.0
+        self.timings = dict.fromkeys(profiler.PHASES, 0.0)
+
+    def add(self, record: profiler.Record):
+        self.calls += 1
+        self.hits += record.cache_hit
+        self.total += record.total
+        for phase, seconds in record.timings.items():
+            self.timings[phase] += seconds
+
+
+class Stats:
+    """
+    A profiler callback that accumulates the records by location.
+    """
+
+    def __init__(self):
+        self.sites = {}
+
+    def __call__(self, record: profiler.Record):
+        key = (record.filename, record.lineno, record.keyword, record.identifier)
+        site = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = _Site()
+        site.add(record)
+
+    def grouped(self, by: str = "line") -> dict:
+        """
+        Return the sites keyed by location, which is "file:line declaration"
+        if `by` is "line", or the filename if `by` is "file".
+        """
+        if by == "line":
+            result = {}
+            for (filename, lineno, keyword, identifier), site in self.sites.items():
+                decl = keyword if not identifier else keyword + "." + identifier
+                result["{}:{} {}".format(filename, lineno, decl)] = site
+            return result
+
+        result = {}
+        for (filename, *_), site in self.sites.items():
+            merged = result.get(filename)
+            if merged is None:
+                merged = result[filename] = _Site()
+            merged.calls += site.calls
+            merged.hits += site.hits
+            merged.total += site.total
+            for phase, seconds in site.timings.items():
+                merged.timings[phase] += seconds
+        return result
+
+    def print_report(self, top: int = 20, by: str = "line", file=None):
+        """
+        Print the `top` locations taking the most time, in milliseconds.
+        """
+        file = file or sys.stdout
+        sites = self.grouped(by)
+        total = sum(site.total for site in sites.values())
+        calls = sum(site.calls for site in sites.values())
+        print(
+            "{} declarations in {:.2f}ms at {} locations".format(
+                calls, total * 1e3, len(sites)
+            ),
+            file=file,
+        )
+
+        headers = ["total", "calls", "hits"] + list(profiler.PHASES)
+        widths = [max(8, len(h)) for h in headers]
+        print(
+            " ".join(h.rjust(w) for h, w in zip(headers, widths)) + "  location",
+            file=file,
+        )
+        ranked = sorted(sites.items(), key=lambda item: item[1].total, reverse=True)
+        for location, site in ranked[:top]:
+            values = ["{:.2f}".format(site.total * 1e3)]
+            values += [str(site.calls), str(site.hits)]
+            values += [
+                "{:.2f}".format(site.timings[phase] * 1e3) for phase in profiler.PHASES
+            ]
+            print(
+                " ".join(v.rjust(w) for v, w in zip(values, widths)) + "  " + location,
+                file=file,
+            )
+
+
+def _export_keywords():
+    """
+    Export the keywords from `lambdex`, which are not exported if lambdex is
+    imported by `python -m`, so that the profiled program can import them.
+    """
+    import lambdex
+    from lambdex import _exports
+
+    for name in _exports.__all__:
+        setattr(lambdex, name, getattr(_exports, name))
+    lambdex.__all__ = _exports.__all__
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import runpy
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m lambdex.stats",
+        description="Profile the lambdex declarations of a script.",
+    )
+    parser.add_argument("-n", "--top", type=int, default=20)
+    parser.add_argument("-g", "--group", choices=["line", "file"], default="line")
+    parser.add_argument("-o", "--output", help="write the report to a file")
+    parser.add_argument("-m", dest="module", action="store_true")
+    parser.add_argument("target", metavar="SCRIPT | MODULE")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    opts = parser.parse_args(argv)
+
+    _export_keywords()
+    stats = Stats()
+    profiler.set_profiler(stats)
+
+    sys.argv = [opts.target] + opts.args
+    status = 0
+    try:
+        if opts.module:
+            runpy.run_module(opts.target, run_name="__main__", alter_sys=True)
+        else:
+            sys.path.insert(0, os.path.dirname(os.path.abspath(opts.target)))
+            runpy.run_path(opts.target, run_name="__main__")
+    except SystemExit as exc:
+        status = exc.code
+    finally:
+        profiler.set_profiler(None)
+
+    if opts.output:
+        with open(opts.output, "w") as fd:
+            stats.print_report(opts.top, opts.group, fd)
+    else:
+        stats.print_report(opts.top, opts.group)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
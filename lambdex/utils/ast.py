@@ -18,6 +18,7 @@ __all__ = [
     "ast_from_source",
     "recursively_set_attr",
     "copy_lineinfo",
+    "fix_missing_locations",
     "is_lvalue",
     "cast_to_ctx",
     "check_compare",
@@ -162,6 +163,43 @@ def copy_lineinfo(src: ast.AST, dst: ast.AST):
     return dst
 
 
+def fix_missing_locations(node: ast.AST) -> ast.AST:
+    """
+    Same as `ast.fix_missing_locations()`, but walks `node` with an explicit
+    stack, so that deeply nested nodes, e.g., long `elif_` chains, do not
+    exceed the recursion limit.
+    """
+    todo = [(node, 1, 0, 1, 0)]
+    while todo:
+        n, lineno, col_offset, end_lineno, end_col_offset = todo.pop()
+        attributes = n._attributes
+        if "lineno" in attributes:
+            if not hasattr(n, "lineno"):
+                n.lineno = lineno
+            else:
+                lineno = n.lineno
+        if "end_lineno" in attributes:
+            if getattr(n, "end_lineno", None) is None:
+                n.end_lineno = end_lineno
+            else:
+                end_lineno = n.end_lineno
+        if "col_offset" in attributes:
+            if not hasattr(n, "col_offset"):
+                n.col_offset = col_offset
+            else:
+                col_offset = n.col_offset
+        if "end_col_offset" in attributes:
+            if getattr(n, "end_col_offset", None) is None:
+                n.end_col_offset = end_col_offset
+            else:
+                end_col_offset = n.end_col_offset
+
+        for child in ast.iter_child_nodes(n):
+            todo.append((child, lineno, col_offset, end_lineno, end_col_offset))
+
+    return node
+
+
 def is_lvalue(node: ast.AST) -> bool:
     """
     Check whether `node` can be L-value.
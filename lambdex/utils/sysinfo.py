@@ -1,21 +1,33 @@
 import sys
-from os.path import dirname, abspath
+from os.path import dirname, abspath, isabs
 
-ROOT_DIR = dirname(dirname(__file__))
+ROOT_DIR = dirname(dirname(abspath(__file__)))
 
+# A sentinel indicating that the importer is not found yet
+_unknown = object()
 
-def get_importer_path():
+_importer_path = _unknown
+
+
+def _find_importer_path(f):
     """
-    Find the first frame that imports lambdex. Return its file path
-    if any.
+    Walk up from frame `f` to the first frame that is not in importlib or
+    lambdex.  Return its file path if any.
     """
-    f = sys._getframe(1)
     filename = None
     while f is not None and f.f_code is not None:
-        filename = abspath(f.f_code.co_filename)
+        filename = f.f_code.co_filename
+
+        # Frames of importlib are frozen, whose names are not paths
+        if "importlib" in filename:
+            f = f.f_back
+            continue
 
-        # If it's in importlib or in lambdex, continue
-        if "importlib" in filename or filename.startswith(ROOT_DIR):
+        # Module paths are absolute unless imported via a relative entry of
+        # `sys.path`, so that `abspath()` is rarely needed
+        if not isabs(filename):
+            filename = abspath(filename)
+        if filename.startswith(ROOT_DIR):
             f = f.f_back
         else:
             break
@@ -23,6 +35,20 @@ def get_importer_path():
     return filename
 
 
+def get_importer_path():
+    """
+    Find the first frame that imports lambdex. Return its file path
+    if any.
+
+    The importer is found on the first call, which happens when lambdex is
+    imported, and the result is reused for the rest of the process.
+    """
+    global _importer_path
+    if _importer_path is _unknown:
+        _importer_path = _find_importer_path(sys._getframe(1))
+    return _importer_path
+
+
 def get_site_paths():
     import site
 
@@ -45,7 +45,8 @@ with codecs.open("README.md", "r", "utf-8") as fd:
         entry_points={
             "console_scripts": [
                 "lxfmt = lambdex.fmt.cli.main:main",
-                "lxfmt-mock = lambdex.fmt.cli.mock:main"
+                "lxfmt-mock = lambdex.fmt.cli.mock:main",
+                "lxfmt-client = lambdex.fmt.cli.client:main",
             ]
         },
         install_requires=_get_requirements(),
@@ -9,14 +9,19 @@ Def = None
 
 
 def _reload_lambdex():
+    """
+    Unload lambdex, and return the modules unloaded.
+    """
+    modules = {}
     for modname in sorted(filter(lambda x: "lambdex" in x, sys.modules)):
-        del sys.modules[modname]
+        modules[modname] = sys.modules.pop(modname)
+    return modules
 
 
 class TestAliases(unittest.TestCase):
     def setUp(self):
         os.environ["LXALIAS"] = "1"
-        _reload_lambdex()
+        self._lambdex_modules = _reload_lambdex()
 
         from lambdex import Def as d
         from lambdex.compiler import core
@@ -33,6 +38,8 @@ class TestAliases(unittest.TestCase):
 
         del os.environ["LXALIAS"]
         _reload_lambdex()
+        # Modules imported lazily by the original lambdex should be found again
+        sys.modules.update(self._lambdex_modules)
 
     def assert_ast_like(self, f, target):
         from lambdex.utils.ast import (
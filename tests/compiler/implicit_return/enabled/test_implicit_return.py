@@ -6,8 +6,13 @@ from astcheck import assert_ast_like
 
 
 def _reload_lambdex():
+    """
+    Unload lambdex, and return the modules unloaded.
+    """
+    modules = {}
     for modname in sorted(filter(lambda x: "lambdex" in x, sys.modules)):
-        del sys.modules[modname]
+        modules[modname] = sys.modules.pop(modname)
+    return modules
 
 
 async_def_ = None
@@ -15,7 +20,7 @@ async_def_ = None
 
 class TestImplicitReturn(unittest.TestCase):
     def setUp(self):
-        _reload_lambdex()
+        self._lambdex_modules = _reload_lambdex()
 
         from lambdex import async_def_ as d
         from lambdex.compiler import core
@@ -31,6 +36,8 @@ class TestImplicitReturn(unittest.TestCase):
         core.__DEBUG__ = False
 
         _reload_lambdex()
+        # Modules imported lazily by the original lambdex should be found again
+        sys.modules.update(self._lambdex_modules)
 
     def assert_ast_like(self, f, target):
         from lambdex.utils.ast import (
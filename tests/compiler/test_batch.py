@@ -0,0 +1,64 @@
+import sys
+import shutil
+import tempfile
+import unittest
+import importlib
+import linecache
+import traceback
+
+from lambdex.compiler import cache
+
+_MODULE_SOURCE = """\
+from lambdex import def_
+from lambdex.compiler import compile_file
+
+NUM_BATCHED = compile_file(__file__, globals())
+
+def make_adder(n):
+    return def_(lambda x: [
+        return_[x + n],
+    ])
+
+fact = def_(lambda n: [
+    return_[1 if n <= 1 else n * callee_(n - 1)],
+])
+
+named = def_.named(lambda: [
+    1 / 0,
+])
+
+# lxfmt: off
+pair = def_.a(lambda: [return_[1]]), def_(lambda: [return_[2]])
+"""
+
+
+class TestCompileFile(unittest.TestCase):
+    def test_compile_file(self):
+        tmpdir = tempfile.mkdtemp()
+        sys.path.insert(0, tmpdir)
+        try:
+            with open(tmpdir + "/lx_batch.py", "w") as fd:
+                fd.write(_MODULE_SOURCE)
+
+            num_cached = len(cache._cache)
+            module = importlib.import_module("lx_batch")
+            # Declarations on the same line are compiled one by one
+            self.assertEqual(module.NUM_BATCHED, 3)
+            self.assertEqual(len(cache._cache), num_cached + 5)
+
+            self.assertEqual(module.make_adder(1)(2), 3)
+            self.assertEqual(module.make_adder(2)(2), 4)
+            self.assertEqual(module.fact(5), 120)
+            self.assertEqual([f() for f in module.pair], [1, 2])
+            self.assertEqual(len(cache._cache), num_cached + 5)
+
+            try:
+                module.named()
+            except ZeroDivisionError as exc:
+                frame = traceback.extract_tb(exc.__traceback__)[-1]
+            self.assertEqual((frame.name, frame.lineno), ("named", 16))
+        finally:
+            sys.path.remove(tmpdir)
+            sys.modules.pop("lx_batch", None)
+            linecache.checkcache()
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,46 @@
+import ast
+import unittest
+
+from lambdex.keywords import def_
+from lambdex.compiler import dispatcher
+from lambdex.compiler.context import ContextFlag
+from lambdex.compiler.dispatcher import find_keyword_free_nodes
+
+
+class TestKeywordFreeNodes(unittest.TestCase):
+    def test_find_keyword_free_nodes(self):
+        tree = ast.parse("def_(lambda: [a < f(b + 1), return_[c], g(lambda: if_)])")
+        free = find_keyword_free_nodes(tree)
+
+        call = tree.body[0].value
+        body = call.args[0].body
+        assign, return_stmt, plain_lambda_call = body.elts
+
+        self.assertNotIn(call, free)
+        self.assertNotIn(body, free)
+        self.assertIn(assign, free)
+        self.assertIn(assign.comparators[0], free)
+        self.assertNotIn(return_stmt, free)
+        self.assertNotIn(return_stmt.value, free)
+
+        # Keywords in ordinary lambdas are never compiled
+        self.assertIn(plain_lambda_call, free)
+        self.assertNotIn(plain_lambda_call.args[0].body, free)
+
+    def test_keyword_free_expressions_are_kept(self):
+        f = def_(lambda a: [
+            b < a[1:3],
+            return_[b + [x for x in a[:1]]],
+        ])
+        self.assertEqual(f([1, 2, 3, 4]), [2, 3, 1])
+
+
+class TestDispatchTable(unittest.TestCase):
+    def test_table_is_kept_for_same_aliases(self):
+        table = dispatcher.get_table()
+        dispatcher.set_aliases(dispatcher.aliases._replace())
+        self.assertIs(dispatcher.get_table(), table)
+
+        self.assertIn((ast.Compare, ContextFlag.should_be_stmt), table)
+        self.assertNotIn((ast.Compare, ContextFlag.should_be_expr), table)
+        self.assertNotIn((ast.BinOp, ContextFlag.should_be_expr), table)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from lambdex import _config
+
+
+class TestFindConfigFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp()).resolve()
+        tree = self.tmpdir / "tree"
+        self.subdir = tree / "a" / "b"
+        self.subdir.mkdir(parents=True)
+        self.config = tree / ".lambdex.cfg"
+        self.config.write_text("[aliases]\n")
+        for path in (tree, tree / "a", self.subdir):
+            os.utime(str(path), (0, 0))
+
+        # Out of the tree, which would be modified by writing the cache
+        self.cache_file = str(self.tmpdir / "cache.json")
+        self.environ = mock.patch.dict(os.environ, LXCFG_CACHE=self.cache_file)
+        self.environ.start()
+        os.environ.pop("LXNOCFG", None)
+        os.environ.pop("LXCFG", None)
+
+        # Search from the temporary directory only
+        self.importer = mock.patch(
+            "lambdex._config.get_importer_path", return_value=None
+        )
+        self.importer.start()
+
+    def tearDown(self):
+        self.importer.stop()
+        self.environ.stop()
+        _config._dir_cache = None
+        shutil.rmtree(str(self.tmpdir))
+
+    def _find(self):
+        return _config._find_config_file([str(self.subdir / "m.py")])
+
+    def test_explicit_path(self):
+        config = self.tmpdir / "lx.cfg"
+        config.write_text("[aliases]\n")
+        os.environ["LXCFG"] = str(config)
+        with mock.patch("lambdex._config._walk_parents") as walk_parents:
+            self.assertEqual(self._find(), config)
+            self.assertFalse(walk_parents.called)
+
+    def test_explicit_path_missing(self):
+        os.environ["LXCFG"] = str(self.tmpdir / "nonexistent.cfg")
+        with self.assertRaisesRegex(FileNotFoundError, "LXCFG"):
+            self._find()
+
+    def test_cache_is_persisted(self):
+        self.assertEqual(self._find(), self.config)
+
+        _config._dir_cache = None
+        with mock.patch("lambdex._config._is_readable_file") as is_readable_file:
+            self.assertEqual(self._find(), self.config)
+            self.assertFalse(is_readable_file.called)
+
+    def test_created_config_is_found(self):
+        self.assertEqual(self._find(), self.config)
+
+        (self.subdir / ".lambdex.cfg").write_text("[aliases]\n")
+        os.utime(str(self.subdir), (1, 1))
+        self.assertEqual(self._find(), self.subdir / ".lambdex.cfg")
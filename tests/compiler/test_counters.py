@@ -0,0 +1,38 @@
+import io
+import json
+import unittest
+
+from lambdex.keywords import def_
+from lambdex.compiler import counters
+
+
+class TestCounters(unittest.TestCase):
+    def setUp(self):
+        counters.reset()
+        counters.set_enabled(True)
+
+    def tearDown(self):
+        counters.set_enabled(False)
+        counters.reset()
+
+    def test_hot_site(self):
+        def f(x):
+            return def_(lambda: [
+                return_[x],
+            ])
+
+        for i in range(counters.HOT_THRESHOLD):
+            self.assertEqual(f(i)(), i)
+        def_.cold(lambda: [return_[0]])
+
+        hot, cold = counters.get_sites()
+        self.assertEqual((hot.calls, hot.misses), (counters.HOT_THRESHOLD, 1))
+        self.assertEqual(hot.lineno, f.__code__.co_firstlineno + 1)
+        self.assertEqual(hot.hint, "asmopt " + f.__qualname__)
+        self.assertEqual((cold.calls, cold.identifier, cold.hint), (1, "cold", ""))
+
+        output = io.StringIO()
+        counters.export(output, format="json", top=1)
+        exported, = json.loads(output.getvalue())
+        self.assertEqual(exported["calls"], counters.HOT_THRESHOLD)
+        self.assertEqual(exported["scope"], f.__qualname__)
@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from lambdex.keywords import def_
+from lambdex.compiler import cache, counters, set_profiler
+from lambdex.compiler.lazy import LazyLambdex
+
+
+class TestLazy(unittest.TestCase):
+    def test_lazy(self):
+        def f(n):
+            return def_.lazy(lambda x: [
+                return_[x + n],
+            ])
+
+        g = f(1)
+        self.assertIsInstance(g, LazyLambdex)
+        self.assertEqual(g(2), 3)
+        self.assertTrue(g.done())
+        self.assertTrue(g.resolve().__name__.startswith("anonymous_"))
+
+        # Resolved at once when cached
+        h = f(2)
+        self.assertIsInstance(h, LazyLambdex)
+        self.assertTrue(h.done())
+        self.assertEqual(h(2), 4)
+        self.assertIs(h.resolve().__code__, g.resolve().__code__)
+
+    def test_error_raised_on_call(self):
+        f = def_.lazy(lambda: [])
+        with self.assertRaises(SyntaxError):
+            f()
+
+    def test_profile_and_count(self):
+        def f():
+            return def_.lazy(lambda: [
+                return_[1 + 1],
+            ])
+
+        records = []
+
+        def callback(record):
+            records.append(record)
+            if len(records) == 1:
+                # Compile on the background thread while this thread is still
+                # counting the enclosing declaration
+                f().resolve()
+
+        counters.reset()
+        counters.set_enabled(True)
+        set_profiler(callback)
+        try:
+            # Uncached, even if warmed up by another test
+            with mock.patch.dict(cache._cache, clear=True):
+                def_(lambda: [return_[0]])
+                self.assertEqual(f()(), 2)
+        finally:
+            set_profiler(None)
+            counters.set_enabled(False)
+
+        sites = {site.lineno: site for site in counters.get_sites()}
+        counters.reset()
+        site = sites[f.__code__.co_firstlineno + 1]
+        self.assertEqual((site.calls, site.misses), (2, 1))
+        self.assertEqual(
+            [(r.lineno, r.cache_hit) for r in records[1:]],
+            [(site.lineno, False), (site.lineno, True)],
+        )
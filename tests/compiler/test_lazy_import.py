@@ -0,0 +1,16 @@
+import sys
+import unittest
+import subprocess
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_compiler_as_attribute(self):
+        code = (
+            "import sys, lambdex\n"
+            "lazy = sys.version_info >= (3, 7)\n"
+            "assert lazy is ('lambdex.compiler' not in sys.modules)\n"
+            "assert lambdex.compiler.compile_lambdex\n"
+            "assert lambdex.ast_parser.lambda_to_ast\n"
+            "assert not hasattr(lambdex, 'nonexistent')\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
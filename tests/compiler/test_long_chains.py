@@ -0,0 +1,61 @@
+import ast
+import sys
+import copy
+import shutil
+import tempfile
+import unittest
+import importlib
+import linecache
+
+from lambdex.utils.ast import fix_missing_locations
+
+
+def _make_chain_module(num_branches: int) -> str:
+    branches = "".join(
+        ".elif_[x == {0}] [\n        return_[{0}],\n    ]".format(i)
+        for i in range(1, num_branches)
+    )
+    return (
+        "from lambdex import def_\n"
+        "f = def_(lambda x: [\n"
+        "    if_[x == 0] [\n        return_[0],\n    ]"
+        + branches
+        + ".else_ [\n        return_[-1],\n    ],\n])\n"
+    )
+
+
+class TestLongChains(unittest.TestCase):
+    def test_fix_missing_locations(self):
+        tree = ast.parse("if a:\n    b = 1\nelif c:\n    d = 2\nelse:\n    e = 3\n")
+        original = ast.dump(tree, include_attributes=True)
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Assign, ast.Name)):
+                del node.lineno, node.col_offset
+        copied = copy.deepcopy(tree)
+
+        fixed = ast.dump(fix_missing_locations(tree), include_attributes=True)
+        self.assertEqual(
+            fixed, ast.dump(ast.fix_missing_locations(copied), include_attributes=True)
+        )
+        self.assertNotEqual(fixed, original)
+
+    def test_fix_missing_locations_deeply_nested(self):
+        node = ast.Pass()
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = ast.If(test=ast.Name(id="x", ctx=ast.Load()), body=[node], orelse=[])
+        self.assertEqual(fix_missing_locations(node).lineno, 1)
+
+    def test_elif_chain(self):
+        tmpdir = tempfile.mkdtemp()
+        sys.path.insert(0, tmpdir)
+        try:
+            with open(tmpdir + "/lx_long_chain.py", "w") as fd:
+                fd.write(_make_chain_module(300))
+            module = importlib.import_module("lx_long_chain")
+            self.assertEqual([module.f(i) for i in (0, 1, 150, 299)], [0, 1, 150, 299])
+            self.assertEqual(module.f(300), -1)
+        finally:
+            sys.path.remove(tmpdir)
+            sys.modules.pop("lx_long_chain", None)
+            linecache.checkcache()
+            shutil.rmtree(tmpdir)
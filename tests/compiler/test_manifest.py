@@ -0,0 +1,59 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import linecache
+import importlib
+import py_compile
+
+from lambdex import manifest
+
+SOURCE = """
+from lambdex import def_
+
+def make(x):
+    return def_(lambda: [
+        if_[x > 0] [
+            return_[x * 2],
+        ],
+        return_[-x],
+    ])
+"""
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.tmpdir, "lx_manifest_mod.py")
+        with open(self.source_path, "w") as fd:
+            fd.write(SOURCE)
+        sys.path.insert(0, self.tmpdir)
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir)
+        sys.modules.pop("lx_manifest_mod", None)
+        manifest._loaded.clear()
+        linecache.checkcache()
+        shutil.rmtree(self.tmpdir)
+
+    def test_sourceless_module(self):
+        manifest_path = manifest.build_manifest(self.source_path, legacy=True)
+        self.assertEqual(
+            manifest_path, os.path.join(self.tmpdir, "lx_manifest_mod.lxm")
+        )
+
+        py_compile.compile(self.source_path, cfile=self.source_path + "c")
+        os.unlink(self.source_path)
+        importlib.invalidate_caches()
+        linecache.checkcache()
+
+        module = importlib.import_module("lx_manifest_mod")
+        self.assertTrue(module.__file__.endswith(".pyc"))
+        self.assertEqual(module.make(3)(), 6)
+        self.assertEqual(module.make(-3)(), 3)
+
+    def test_no_declarations(self):
+        with open(self.source_path, "w") as fd:
+            fd.write("x = 1\n")
+        self.assertIsNone(manifest.build_manifest(self.source_path))
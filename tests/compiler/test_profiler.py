@@ -0,0 +1,46 @@
+import io
+import unittest
+
+from lambdex.keywords import def_
+from lambdex.compiler import profiler, set_profiler
+from lambdex.stats import Stats
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.records = []
+        set_profiler(self.records.append)
+
+    def tearDown(self):
+        set_profiler(None)
+
+    def test_miss_and_hit(self):
+        def f():
+            return def_.f(lambda: [
+                return_[1 + 1],
+            ])
+
+        self.assertEqual(f()(), 2)
+        self.assertEqual(f()(), 2)
+
+        miss, hit = self.records
+        self.assertFalse(miss.cache_hit)
+        self.assertEqual(list(miss.timings), list(profiler.PHASES))
+        self.assertTrue(hit.cache_hit)
+        self.assertEqual(list(hit.timings), ["wrap"])
+        self.assertEqual((miss.keyword, miss.identifier), ("def_", "f"))
+        self.assertEqual(miss.lineno, f.__code__.co_firstlineno + 1)
+
+    def test_stats_report(self):
+        stats = Stats()
+        set_profiler(stats)
+        for _ in range(3):
+            def_(lambda: [return_[1]])
+
+        site, = stats.sites.values()
+        self.assertEqual((site.calls, site.hits), (3, 2))
+
+        output = io.StringIO()
+        stats.print_report(file=output)
+        self.assertIn("3 declarations", output.getvalue())
+        self.assertIn("{}:".format(__file__), output.getvalue())
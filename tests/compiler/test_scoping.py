@@ -63,6 +63,23 @@ class TestScoping(unittest.TestCase):
         self.assertEqual(var, 2)
         self.assertIs(fc, f)
 
+    def test_closure_without_callee(self):
+        VAR = 2
+        f = def_(lambda: [
+            return_[1],
+        ])
+        g = def_(lambda: [
+            return_[VAR],
+        ])
+        h = def_(lambda n: [
+            return_[n if n < 2 else callee_(n - 1) + VAR],
+        ])
+
+        self.assertIsNone(f.__closure__)
+        self.assertEqual([c.cell_contents for c in g.__closure__], [2])
+        self.assertEqual(len(h.__closure__), 2)
+        self.assertEqual((f(), g(), h(3)), (1, 2, 5))
+
     def test_set_nonlocal(self):
         VAR = 2
         f = def_(lambda: [
@@ -0,0 +1,29 @@
+import unittest
+from unittest import mock
+
+from lambdex.utils import sysinfo
+
+
+def _nested(depth, func):
+    if depth:
+        return _nested(depth - 1, func)
+    return func()
+
+
+class TestImporterPath(unittest.TestCase):
+    def setUp(self):
+        self._saved = sysinfo._importer_path
+        sysinfo._importer_path = sysinfo._unknown
+
+    def tearDown(self):
+        sysinfo._importer_path = self._saved
+
+    def test_importer_is_found_once(self):
+        with mock.patch("lambdex.utils.sysinfo.abspath") as abspath:
+            path = _nested(200, sysinfo.get_importer_path)
+            self.assertEqual(path, __file__)
+            self.assertFalse(abspath.called)
+
+        with mock.patch("lambdex.utils.sysinfo._find_importer_path") as find:
+            self.assertEqual(sysinfo.get_importer_path(), path)
+            self.assertFalse(find.called)
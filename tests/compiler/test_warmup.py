@@ -0,0 +1,59 @@
+import gc
+import sys
+import shutil
+import tempfile
+import unittest
+import importlib
+import linecache
+from unittest import mock
+
+from lambdex.compiler import cache, warm_up
+
+_MODULE_SOURCE = """\
+from lambdex import def_
+
+def make_adder(n):
+    return def_(lambda x: [
+        return_[x + n],
+    ])
+"""
+
+
+class TestWarmUp(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        sys.path.insert(0, self.tmpdir)
+
+        # warm_up() runs before forking, so the transpiler must not start
+        self.transpile_file = mock.patch("lambdex.compiler.core.transpile_file")
+        self.transpile_file.start().side_effect = AssertionError
+
+    def tearDown(self):
+        self.transpile_file.stop()
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
+        sys.path.remove(self.tmpdir)
+        linecache.checkcache()
+        shutil.rmtree(self.tmpdir)
+
+    def _import(self, name: str):
+        with open("{}/{}.py".format(self.tmpdir, name), "w") as fd:
+            fd.write(_MODULE_SOURCE)
+        self.addCleanup(sys.modules.pop, name, None)
+        return importlib.import_module(name)
+
+    def test_warm_up(self):
+        module = self._import("lx_warmup")
+
+        self.assertEqual(warm_up([module], freeze=True), 1)
+        self.assertEqual(warm_up([module]), 0)
+
+        num_cached = len(cache._cache)
+        self.assertEqual(module.make_adder(1)(2), 3)
+        self.assertEqual(len(cache._cache), num_cached)
+
+    def test_default_modules(self):
+        module = self._import("lx_warmup_default")
+
+        self.assertGreaterEqual(warm_up(), 1)
+        self.assertEqual(warm_up([module]), 0)
@@ -0,0 +1,4 @@
+from lambdex import def_
+
+f = def_(lambda: [try_[a].except_[def_(lambda: [try_[b].except_[E][c].except_[d]])][e].except_[x[1]]  # comment
+[f[2]], g])
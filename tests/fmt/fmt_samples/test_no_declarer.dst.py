@@ -0,0 +1,11 @@
+# A module without any lambdex declaration is left untouched
+import os
+
+
+def  define_(x ,y):
+    return [x,
+              y]   # trailing comment
+
+
+undef_ = define_(1,
+    2)
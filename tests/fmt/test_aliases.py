@@ -0,0 +1,44 @@
+import os
+import shutil
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from lambdex.fmt.utils.aliases import AliasesCache
+from lambdex.fmt.core.tkutils.rules import matcher
+
+
+class TestAliasesCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+        self.config = self.tmpdir / ".lambdex.cfg"
+        self.config.write_text("[aliases]\ndef_ = lx\n")
+        self.subdir = self.tmpdir / "pkg"
+        self.subdir.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(str(self.tmpdir))
+        matcher.reset_aliases()
+
+    def test_config_is_found_once_per_directory(self):
+        cache = AliasesCache()
+        with mock.patch.dict(os.environ, LXALIAS="1"):
+            self.assertEqual(cache.get(str(self.subdir / "a.py")).def_, "lx")
+            with mock.patch("lambdex._config._find_config_file") as find:
+                self.assertEqual(cache.get(str(self.subdir / "b.py")).def_, "lx")
+                self.assertFalse(find.called)
+
+    def test_modified_config_is_read_again(self):
+        cache = AliasesCache()
+        with mock.patch.dict(os.environ, LXALIAS="1"):
+            self.assertEqual(cache.get(str(self.subdir / "a.py")).def_, "lx")
+            self.config.write_text("[aliases]\ndef_ = lambdex\n")
+            os.utime(str(self.config), (0, 0))
+            self.assertEqual(cache.get(str(self.subdir / "a.py")).def_, "lambdex")
+
+    def test_table_is_kept_for_same_aliases(self):
+        matcher.reset_aliases()
+        table = matcher._table
+        matcher.reset_aliases()
+        self.assertIs(matcher._table, table)
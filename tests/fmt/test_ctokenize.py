@@ -0,0 +1,47 @@
+import pathlib
+import unittest
+from io import BytesIO
+
+from lambdex.fmt.core.tkutils import ctokenize
+from lambdex.fmt.core.tkutils.tokenize import AddWhitespace
+from lambdex.fmt.core.tkutils.builtins import tokenize as bltokenize
+
+SAMPLES_DIR = pathlib.Path(__file__).absolute().parent / "fmt_samples"
+
+SOURCES = [
+    b"x = 1",
+    b"x = 1 \\\n  \\\n    + 2\n",
+    b"x = (1 +\\\n 2)\n",
+    b"x = 1\n\\\ny = 2\n",
+    b"if x:\r\n    y = 1\r\n\r\n# c\r\n",
+    b"\xef\xbb\xbfx = '\xc3\xa9'\n",
+    b"# -*- coding: latin-1 -*-\nx = '\xe9'\n",
+    b"def f():\n\tif x:\n\t\treturn 1\n\x0cy = 2\n",
+    b'x = f"""a\n{b!r:>{w}}\n{{}}"""\ny = f"{x}" f"{ {1: 2}[1] }"  # c\n',
+    b"x = '''\xc3\xa9\n\n\xc3\xa9'''\n",
+    b"if x:\n    pass\n  # comment\n\n",
+]
+
+
+def _dump(tokens):
+    return [(t.type, t.string, t.start, t.end, t.line) for t in tokens]
+
+
+@unittest.skipUnless(ctokenize.AVAILABLE, "requires the C tokenizer")
+class TestCTokenize(unittest.TestCase):
+    def assertSameTokens(self, source):
+        expected = _dump(AddWhitespace(bltokenize.tokenize(BytesIO(source).readline)))
+        actual = _dump(ctokenize.tokenize(BytesIO(source).readline))
+        self.assertEqual(actual, expected, msg=source)
+
+    def test_sources(self):
+        for source in SOURCES:
+            self.assertSameTokens(source)
+
+    def test_samples(self):
+        for src in sorted(SAMPLES_DIR.rglob("*.py")):
+            self.assertSameTokens(src.read_bytes())
+
+    def test_rejected_source(self):
+        with self.assertRaises(ctokenize.CTokenizeError):
+            list(ctokenize.tokenize(BytesIO(b"x = 'abc\n").readline))
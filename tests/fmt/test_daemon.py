@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+import shutil
+import pathlib
+import tempfile
+import unittest
+import subprocess
+
+TEST_DIR = pathlib.Path(__file__).parent
+SAMPLES_DIR = TEST_DIR / "fmt_samples"
+ROOT_DIR = TEST_DIR.parent.parent
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+        self.socket = self.tmpdir / "lxfmt.sock"
+        self.env = dict(os.environ, LXALIAS="1", LXFMT_SOCKET=str(self.socket))
+        self.daemon = None
+
+    def tearDown(self):
+        if self.daemon is not None:
+            self.daemon.terminate()
+            self.daemon.wait(10)
+            self.assertFalse(self.socket.exists(), msg="socket left over")
+        shutil.rmtree(str(self.tmpdir))
+
+    def _start_daemon(self):
+        self.daemon = subprocess.Popen(
+            [sys.executable, "-m", "lambdex.fmt", "--daemon"],
+            cwd=str(ROOT_DIR),
+            env=self.env,
+        )
+        deadline = time.time() + 30
+        while not self.socket.exists():
+            self.assertIsNone(self.daemon.poll(), msg="daemon exits unexpectedly")
+            self.assertLess(time.time(), deadline, msg="daemon does not start")
+            time.sleep(0.05)
+
+    def _run_client(self, *args, stdin=b""):
+        p = subprocess.Popen(
+            [sys.executable, "-m", "lambdex.fmt.cli.client"] + list(args),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=str(ROOT_DIR),
+            env=self.env,
+        )
+        stdout, stderr = p.communicate(stdin)
+        return p.returncode, stdout, stderr.decode()
+
+    def _check_client(self):
+        src = SAMPLES_DIR / "test_demo.src.py"
+        expected = (SAMPLES_DIR / "test_demo.dst.py").read_bytes()
+
+        returncode, stdout, stderr = self._run_client(stdin=src.read_bytes())
+        self.assertEqual(returncode, 0, msg="STDERR:\n" + stderr)
+        self.assertEqual(stdout.rstrip(), expected.rstrip())
+
+        relpath = str(src.relative_to(ROOT_DIR))
+        returncode, stdout, stderr = self._run_client("-d", relpath)
+        self.assertEqual(returncode, 1, msg="STDERR:\n" + stderr)
+        self.assertTrue(stdout.startswith(b"--- " + relpath.encode()), msg=stdout)
+
+        returncode, stdout, stderr = self._run_client("-i")
+        self.assertEqual(returncode, 2)
+        self.assertIn("reading from stdin", stderr)
+
+    def test_served_by_daemon(self):
+        self._start_daemon()
+        self._check_client()
+        self.assertIsNone(self.daemon.poll())
+
+    def test_refuse_shared_directory(self):
+        from lambdex.fmt.cli.daemon import _prepare_socket_path
+
+        os.chmod(str(self.tmpdir), 0o777)
+        with self.assertRaises(PermissionError):
+            _prepare_socket_path(str(self.socket))
+
+        link = self.tmpdir.parent / (self.tmpdir.name + ".link")
+        os.chmod(str(self.tmpdir), 0o700)
+        os.symlink(str(self.tmpdir), str(link))
+        try:
+            with self.assertRaises(PermissionError):
+                _prepare_socket_path(str(link / "lxfmt.sock"))
+        finally:
+            os.unlink(str(link))
+
+        _prepare_socket_path(str(self.socket))
+
+    def test_fallback_without_daemon(self):
+        self._check_client()
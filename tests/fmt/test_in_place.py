@@ -0,0 +1,70 @@
+import os
+import sys
+import shutil
+import pathlib
+import tempfile
+import unittest
+import subprocess
+
+TEST_DIR = pathlib.Path(__file__).parent
+SAMPLES_DIR = TEST_DIR / "fmt_samples"
+
+
+def _run_fmt_in_place(filename):
+    p = subprocess.Popen(
+        [sys.executable, "-m", "lambdex.fmt", "-i", str(filename)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=str(TEST_DIR.parent.parent),
+        env=dict(LXALIAS="1", **os.environ),
+    )
+    stdout, stderr = p.communicate()
+    return p.returncode, stderr.decode()
+
+
+class TestInPlace(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = pathlib.Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(str(self.tmpdir))
+
+    def _copy_sample(self, name, *, crlf=False):
+        content = (SAMPLES_DIR / name).read_bytes()
+        if crlf:
+            content = content.replace(b"\n", b"\r\n")
+        target = self.tmpdir / name
+        target.write_bytes(content)
+        return target
+
+    def test_unchanged_file_is_not_rewritten(self):
+        target = self._copy_sample("test_augassign.dst.py")
+        os.utime(str(target), (0, 0))
+
+        returncode, stderr = _run_fmt_in_place(target)
+        self.assertEqual(returncode, 0, msg="STDERR:\n" + stderr)
+        self.assertEqual(target.stat().st_mtime, 0)
+        self.assertEqual(
+            list(self.tmpdir.iterdir()), [target], msg="temporary file left over"
+        )
+
+    def test_changed_file_is_rewritten(self):
+        target = self._copy_sample("test_demo.src.py")
+        target.chmod(0o640)
+
+        returncode, stderr = _run_fmt_in_place(target)
+        self.assertEqual(returncode, 0, msg="STDERR:\n" + stderr)
+        expected = (SAMPLES_DIR / "test_demo.dst.py").read_bytes()
+        self.assertEqual(target.read_bytes().rstrip(), expected.rstrip())
+        self.assertEqual(target.stat().st_mode & 0o777, 0o640)
+        self.assertEqual(list(self.tmpdir.iterdir()), [target])
+
+    def test_newline_style_is_preserved(self):
+        target = self._copy_sample("test_demo.src.py", crlf=True)
+
+        returncode, stderr = _run_fmt_in_place(target)
+        self.assertEqual(returncode, 0, msg="STDERR:\n" + stderr)
+        expected = (SAMPLES_DIR / "test_demo.dst.py").read_bytes()
+        self.assertEqual(
+            target.read_bytes().rstrip(), expected.replace(b"\n", b"\r\n").rstrip()
+        )
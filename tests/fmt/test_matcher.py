@@ -0,0 +1,33 @@
+import unittest
+
+from lambdex.fmt.core.definitions import tk, State, TokenInfo
+from lambdex.fmt.core.tkutils.rules import matcher
+
+
+def _probe_tokens():
+    strings = set(matcher._keyword_to_symbol)
+    strings.update(["lambda", "_", "foo", "def_x"])
+    for string in strings:
+        if string.isidentifier():
+            yield TokenInfo(tk.NAME, string)
+        else:
+            yield TokenInfo(tk.OP, string)
+
+    for string in tk.EXACT_TOKEN_TYPES:
+        yield TokenInfo(tk.OP, string)
+
+    for type in tk.tok_name:
+        if type not in (tk.NAME, tk.OP):
+            yield TokenInfo(type, "")
+
+
+class TestMatcher(unittest.TestCase):
+    def test_compiled_table_agrees_with_queries(self):
+        matcher.reset_aliases()
+        for token in _probe_tokens():
+            for state in State:
+                self.assertIs(
+                    matcher._resolve(token, state),
+                    matcher._lookup(token, state),
+                    msg="{!r} at {}".format(token.string, state),
+                )
@@ -0,0 +1,71 @@
+import pathlib
+import unittest
+from io import BytesIO
+
+from lambdex.fmt.core import ranges
+from lambdex.fmt.core.api import FormatCode
+from lambdex.fmt.core.tkutils.rules import matcher
+
+SAMPLES_DIR = pathlib.Path(__file__).absolute().parent / "fmt_samples"
+
+STMT = "f{} = def_(lambda: [pass_, pass_])\n"
+
+
+def _format(source: str, lines=None) -> str:
+    return FormatCode(BytesIO(source.encode()).readline, lines=lines)
+
+
+class TestRange(unittest.TestCase):
+    def setUp(self):
+        matcher.reset_aliases()
+        ranges._last_scan = (b"", [])
+
+    def _formatted_stmt(self, i):
+        formatted = _format(STMT.format(i))
+        self.assertNotEqual(formatted, STMT.format(i))
+        return formatted
+
+    def test_whole_range(self):
+        for src in sorted(SAMPLES_DIR.glob("*.src.py")):
+            source = src.read_text()
+            num_lines = source.count("\n") + 1
+            self.assertEqual(
+                _format(source, lines=(1, num_lines)), _format(source), msg=src.name
+            )
+
+    def test_only_overlapping_statements(self):
+        source = "".join(STMT.format(i) for i in range(4))
+        expected = (
+            STMT.format(0)
+            + self._formatted_stmt(1)
+            + self._formatted_stmt(2)
+            + STMT.format(3)
+        )
+        self.assertEqual(_format(source, lines=(2, 3)), expected)
+
+    def test_disabled_statements(self):
+        source = "# lxfmt: off\n" + STMT.format(0) + "# lxfmt: on\n" + STMT.format(1)
+        expected = "# lxfmt: off\n{}# lxfmt: on\n{}".format(
+            STMT.format(0), self._formatted_stmt(1)
+        )
+        self.assertEqual(_format(source, lines=(1, 4)), expected)
+
+    def test_resume_after_edit(self):
+        source = "".join(STMT.format(i) for i in range(10))
+        _format(source, lines=(10, 10))
+
+        edited_stmt = "f5 = def_(lambda: [pass_,  pass_])\n"
+        edited = source.replace(STMT.format(5), edited_stmt)
+        self.assertEqual(
+            _format(edited, lines=(6, 6)),
+            source.replace(STMT.format(5), _format(edited_stmt)),
+        )
+
+    def test_keep_scanned_source_only(self):
+        source = "".join(STMT.format(i) for i in range(10))
+        _format(source, lines=(2, 2))
+
+        last_content, last_starts = ranges._last_scan
+        self.assertEqual([start.row for start in last_starts], [1, 2, 3])
+        scanned = "".join(STMT.format(i) for i in range(3))
+        self.assertEqual(last_content, scanned.encode())